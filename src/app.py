@@ -1,5 +1,5 @@
 # Importing Variables
-from bot import bot, datetime, discord, json, pymongo, requests, time, ast, traceback
+from bot import bot, datetime, discord, json, pymongo, time, ast, traceback
 from utils.constants import (
     GUILD_ID,
     LINK,
@@ -30,7 +30,8 @@ from utils.roles import (
     is_chat_moderator,
     is_bot_developer,
 )
-from utils.mongodb import gpdb, repdb, rrdb, smdb, kwdb
+from utils.mongodb import gpdb, repdb, rrdb, smdb, kwdb, get_db
+from utils.http import http
 import re
 
 # Importing Files
@@ -46,6 +47,7 @@ from events import (
     on_voice_state_update,
     auto_moderation,
     on_message_edit,
+    on_rep_change,
 )
 from commands import (
     role as role_command,
@@ -61,6 +63,7 @@ from commands import (
     random_pyp,
     reputation,
     advstick,
+    diagnostics,
 )
 
 
@@ -177,7 +180,7 @@ async def rrmake(
                 await reaction_msg.add_reaction(x[0])
                 data = x.copy()
                 data.append(msg_id)
-                rrdb.new_rr(data)
+                await rrdb.new_rr(data)
             await interaction.send("Reaction Added!", ephemeral=True)
         except ValueError:
             await interaction.send("Invalid input", ephemeral=True)
@@ -389,7 +392,7 @@ async def refreshhelpers(ctx):
         except Exception:
             continue
     if changed:
-        mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", ctx.guild.id)) 
+        mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", ctx.guild.id)) 
         timenow = int(time.time()) + 1
         embed = discord.Embed(description="Helpers Refreshed !!", color=0x51ADBB)
         embed.set_author(name=str(ctx.author), icon_url=ctx.author.display_avatar.url)
@@ -434,13 +437,13 @@ async def joke(
     await interaction.response.defer()
 
     url = f"https://v2.jokeapi.dev/joke/{'Any' if category is None else category}?blacklistFlags=nsfw,religious,political,racist,sexist,explicit"
-    res = requests.request("GET", url)
+    res = await http.get(url)
 
     if not res.ok:
         await interaction.send("Error fetching joke.")
         return
 
-    data = json.loads(res.text)
+    data = res.json()
 
     if data["type"] == "single":
         joke = data["joke"]
@@ -464,18 +467,18 @@ async def meme(
     await interaction.response.defer()
 
     async def get_sfw_meme():
-        response = requests.request("GET", f"https://meme-api.com/gimme/{subreddit}")
+        response = await http.get(f"https://meme-api.com/gimme/{subreddit}")
 
         if not response.ok:
             await interaction.send("Error fetching meme.")
             return
 
-        data = json.loads(response.text)
+        data = response.json()
 
         if "count" in data:
             data = data["memes"][0]
 
-        return data["url"] if not data["nsfw"] else get_sfw_meme()
+        return data["url"] if not data["nsfw"] else await get_sfw_meme()
 
     image_url = await get_sfw_meme()
     await interaction.send(image_url)
@@ -493,9 +496,9 @@ async def search(
 ):
     await interaction.response.defer(ephemeral=True)
     try:
-        response = requests.get(
-            f"https://paper.sc/search/?as=json&query={query}"
-        ).json()
+        response = await http.get_json(
+            "https://paper.sc/search/", params={"as": "json", "query": query}
+        )
         if len(response["list"]) == 0:
             await interaction.send(
                 "No results found in past papers. Try changing your query for better results.",
@@ -672,45 +675,45 @@ async def set_preferences(
     guild_id = interaction.guild.id
 
     if modlog_channel:
-        gpdb.set_pref("modlog_channel", modlog_channel.id, guild_id)
+        await gpdb.set_pref("modlog_channel", modlog_channel.id, guild_id)
     if rep_enabled is not None:
-        gpdb.set_pref("rep_enabled", rep_enabled, guild_id)
+        await gpdb.set_pref("rep_enabled", rep_enabled, guild_id)
     if welcome_channel:
-        gpdb.set_pref("welcome_channel", welcome_channel.id, guild_id)
+        await gpdb.set_pref("welcome_channel", welcome_channel.id, guild_id)
     if warnlog_channel:
-        gpdb.set_pref("warnlog_channel", warnlog_channel.id, guild_id)
+        await gpdb.set_pref("warnlog_channel", warnlog_channel.id, guild_id)
     if behavior_log_channel:
-        gpdb.set_pref("behavior_log_channel", behavior_log_channel.id, guild_id)
+        await gpdb.set_pref("behavior_log_channel", behavior_log_channel.id, guild_id)
     if feedback_channel:
-        gpdb.set_pref("feedback_channel", feedback_channel.id, guild_id)
+        await gpdb.set_pref("feedback_channel", feedback_channel.id, guild_id)
     if anon_confession_channel:
-        gpdb.set_pref("anon_confession_channel", anon_confession_channel.id, guild_id)
+        await gpdb.set_pref("anon_confession_channel", anon_confession_channel.id, guild_id)
     if counting_channel:
-        gpdb.set_pref("counting_channel", counting_channel.id, guild_id)
+        await gpdb.set_pref("counting_channel", counting_channel.id, guild_id)
     if chatmod_apps_channel:
-        gpdb.set_pref("chatmod_apps_channel", chatmod_apps_channel.id, guild_id)
+        await gpdb.set_pref("chatmod_apps_channel", chatmod_apps_channel.id, guild_id)
     if botlogs_channel:
-        gpdb.set_pref("botlogs_channel", botlogs_channel.id, guild_id)
+        await gpdb.set_pref("botlogs_channel", botlogs_channel.id, guild_id)
     if modmail_logs_channel:
-        gpdb.set_pref("modmail_logs_channel", modmail_logs_channel.id, guild_id)
+        await gpdb.set_pref("modmail_logs_channel", modmail_logs_channel.id, guild_id)
     if create_dm_channel:
-        gpdb.set_pref("create_dm_channel", create_dm_channel.id, guild_id)
+        await gpdb.set_pref("create_dm_channel", create_dm_channel.id, guild_id)
     if closed_dm_channel:
-        gpdb.set_pref("closed_dm_channel", closed_dm_channel.id, guild_id)
+        await gpdb.set_pref("closed_dm_channel", closed_dm_channel.id, guild_id)
     if dm_threads_channel:
-        gpdb.set_pref("dm_threads_channel", dm_threads_channel.id, guild_id)
+        await gpdb.set_pref("dm_threads_channel", dm_threads_channel.id, guild_id)
     if feedback_mods_channel:
-        gpdb.set_pref("feedback_mods_channel", feedback_mods_channel.id, guild_id)
+        await gpdb.set_pref("feedback_mods_channel", feedback_mods_channel.id, guild_id)
     if confession_approval_channel:
-        gpdb.set_pref("confession_approval_channel", confession_approval_channel.id, guild_id)
+        await gpdb.set_pref("confession_approval_channel", confession_approval_channel.id, guild_id)
     if hotm_results_channel:
-        gpdb.set_pref("hotm_results_channel", hotm_results_channel.id, guild_id)
+        await gpdb.set_pref("hotm_results_channel", hotm_results_channel.id, guild_id)
     if study_session_channel:
-        gpdb.set_pref("study_session_channel", study_session_channel.id, guild_id)
+        await gpdb.set_pref("study_session_channel", study_session_channel.id, guild_id)
     if action_required_channel:
-        gpdb.set_pref("action_required_channel", action_required_channel.id, guild_id)
+        await gpdb.set_pref("action_required_channel", action_required_channel.id, guild_id)
     if botnews_channel:
-        gpdb.set_pref("botnews_channel", botnews_channel.id, guild_id)
+        await gpdb.set_pref("botnews_channel", botnews_channel.id, guild_id)
         
     await interaction.send("Guild preferences have been updated successfully!", ephemeral=True)
 
@@ -726,7 +729,7 @@ async def study_session(interaction: discord.Interaction):
         )
         return
     await interaction.response.defer()
-    study_sesh_channel = bot.get_channel(gpdb.get_pref("study_session_channel", interaction.guild.id)) 
+    study_sesh_channel = bot.get_channel(await gpdb.get_pref("study_session_channel", interaction.guild.id)) 
     msg_history = await study_sesh_channel.history(limit=3).flatten()
     for msg in msg_history:
         if (
@@ -797,13 +800,13 @@ async def feedback(
     global FEEDBACK_NAME
     await interaction.response.send_modal(modal=Feedback())
     if target == "Bot Developers":
-        FEEDBACK_CHANNEL_ID = gpdb.get_pref("feedback_channel", interaction.guild.id)
+        FEEDBACK_CHANNEL_ID = await gpdb.get_pref("feedback_channel", interaction.guild.id)
         FEEDBACK_NAME = "Bot Feedback"
     elif target == "Moderators":
-        FEEDBACK_CHANNEL_ID = gpdb.get_pref("feedback_mods_channel", interaction.guild.id)
+        FEEDBACK_CHANNEL_ID = await gpdb.get_pref("feedback_mods_channel", interaction.guild.id)
         FEEDBACK_NAME = "Mod Feedback"
     else:
-        FEEDBACK_CHANNEL_ID = gpdb.get_pref("feedback_mods_channel", interaction.guild.id)
+        FEEDBACK_CHANNEL_ID = await gpdb.get_pref("feedback_mods_channel", interaction.guild.id)
         FEEDBACK_NAME = "Repository Feedback"
 
 
@@ -820,8 +823,7 @@ async def sync_commands(ctx: discord.Message):
 async def funfact(interaction: discord.Interaction):
     await interaction.response.defer()
     url = "https://uselessfacts.jsph.pl/random.json?language=en"
-    response = requests.request("GET", url)
-    data = json.loads(response.text)
+    data = await http.get_json(url)
     useless_fact = data["text"]
     await interaction.send(useless_fact)
 
@@ -857,7 +859,7 @@ async def Instantlockcommand(
             ephemeral=True,
         )
         return
-    mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", interaction.guild.id))
+    mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", interaction.guild.id))
     if mod_log_channel:
         timenow = int(time.time()) + 1
         if action_type == "Forum Lock":
@@ -895,8 +897,7 @@ async def Instantlockcommand(
                     )
                     await thread.send("This thread has been locked.")
                 else:
-                    client = pymongo.MongoClient(LINK)
-                    db = client.IGCSEBot
+                    db = get_db()
                     locks = db["forumlock"]
                     embed = discord.Embed(
                         description="Instant Forum Lockdown", colour=discord.Colour.green()
@@ -974,8 +975,7 @@ async def Instantlockcommand(
                     )
                     await channel.send("This channel has been locked.")
                 else:
-                    client = pymongo.MongoClient(LINK)
-                    db = client.IGCSEBot
+                    db = get_db()
                     locks = db["channellock"]
                     overwrite.send_messages = True
                     overwrite.send_messages_in_threads = True
@@ -1030,7 +1030,7 @@ class ChatModerator(discord.ui.Modal):
         self.add_item(self.timezone)
 
     async def callback(self, interaction: discord.Interaction):
-        chatmod_app_channel = bot.get_channel(gpdb.get_pref("chatmod_apps_channel", interaction.guild.id)) 
+        chatmod_app_channel = bot.get_channel(await gpdb.get_pref("chatmod_apps_channel", interaction.guild.id)) 
 
         application_embed = discord.Embed(
             title="New application received", color=0xE3FB6D
@@ -1204,8 +1204,8 @@ async def confess(
     ),
 ):
 
-    approval_channel = bot.get_channel(gpdb.get_pref("confession_approval_channel", interaction.guild.id)) 
-    confession_channel = bot.get_channel(gpdb.get_pref("anon_confession_channel", interaction.guild.id)) 
+    approval_channel = bot.get_channel(await gpdb.get_pref("confession_approval_channel", interaction.guild.id)) 
+    confession_channel = bot.get_channel(await gpdb.get_pref("anon_confession_channel", interaction.guild.id)) 
 
     view = discord.ui.View(timeout=None)
     approveBTN = discord.ui.Button(label="Approve", style=discord.ButtonStyle.blurple)
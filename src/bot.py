@@ -2,22 +2,51 @@ import datetime
 import time
 import typing
 import pymongo
-import requests
 import nextcord as discord
 import traceback
 import ast
 import json
 import random
-import pyshorteners
 
 from nextcord.ext import tasks, commands
 from utils.constants import GUILD_ID
+from utils.metrics import metrics
+from utils.http import http
+
+
+class Bot(commands.Bot):
+    def event(self, coro):
+        return super().event(metrics.timed(f"event:{coro.__name__}")(coro))
+
+    def listen(self, name: str = discord.utils.MISSING):
+        def decorator(func):
+            self.add_listener(metrics.timed(f"listener:{func.__name__}")(func), name)
+            return func
+
+        return decorator
+
+    async def close(self):
+        await http.close()
+        await super().close()
+
 
 intents = discord.Intents().all()
-bot = commands.Bot(
+bot = Bot(
     command_prefix=".",
     intents=intents,
     allowed_mentions=discord.AllowedMentions(everyone=False),
 )
+
+
+@bot.application_command_before_invoke
+async def before_application_command(interaction):
+    metrics.begin(f"command:{interaction.application_command.qualified_name}")
+
+
+@bot.application_command_after_invoke
+async def after_application_command(interaction):
+    metrics.finish()
+
+
 guild = bot.get_guild(GUILD_ID)
 keywords = {}
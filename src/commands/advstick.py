@@ -2,6 +2,7 @@ import time
 from bot import discord, bot
 from utils.constants import GUILD_ID
 from utils.mongodb import smdb, gpdb
+from utils.scheduler import scheduler
 
 
 @bot.slash_command(
@@ -50,12 +51,15 @@ async def advstick(
         await interaction.response.send_message("The requested message could not be found. It may have been deleted or the ID provided is incorrect.", ephemeral=True)
         return
     
-    await smdb.timed_sticky(
+    identifier = await smdb.timed_sticky(
         channel,
         message,
         stick_time,
         unstick_time,
     )
+    if identifier:
+        scheduler.schedule(stick_time, "stick", identifier)
+        scheduler.schedule(unstick_time, "unstick", identifier)
 
         
     await interaction.send(f"Advstick has been successfully scheduled to stick at <t:{stick_time}:F> (<t:{stick_time}:R>) and unstick at <t:{unstick_time}:F> (<t:{unstick_time}:R>)", ephemeral=True)
\ No newline at end of file
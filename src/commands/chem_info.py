@@ -1,8 +1,9 @@
 from bot import bot, discord
 from typing import Optional
+from utils.http import http
+from utils.metrics import awaiting
 import pubchempy as pcp
-import requests
-import json
+import asyncio
 import re
 
 metals = [
@@ -57,6 +58,13 @@ metals = [
 ]
 
 
+def lookup_compound(query: str, namespace: str):
+    # pubchempy makes blocking requests, and fetches synonyms again on every
+    # access, so both happen here in a worker thread.
+    compound = pcp.get_compounds(query, namespace)[0]
+    return compound, compound.synonyms[:10]
+
+
 @bot.slash_command(
     description="Information about a compound/element using the formula or name"
 )
@@ -74,9 +82,10 @@ async def cheminfo(
         return
     await interaction.response.defer()
     try:
-        compound = pcp.get_compounds(name or formula, "formula" if formula else "name")[
-            0
-        ]
+        with awaiting("http"):
+            compound, compound_synonyms = await asyncio.to_thread(
+                lookup_compound, name or formula, "formula" if formula else "name"
+            )
         is_ion = compound.charge != 0
         is_element = not is_ion and len(compound.atoms) == 1
         experimental_properties = await get_experimental_properties(compound.cid)
@@ -86,7 +95,7 @@ async def cheminfo(
                 filter(
                     lambda x: not re.search(r"[0-9]", x)
                     and x != compound.molecular_formula,
-                    compound.synonyms[:10],
+                    compound_synonyms,
                 )
             )
             or None
@@ -158,8 +167,7 @@ async def get_experimental_properties(cid):
         url = (
             f"https://pubchem.ncbi.nlm.nih.gov/rest/pug_view/data/compound/{cid}/JSON/"
         )
-        response = requests.get(url)
-        data = json.loads(response.text)
+        data = await http.get_json(url)
         for section in data["Record"]["Section"]:
             if section["TOCHeading"] == "Chemical and Physical Properties":
                 main_section = section
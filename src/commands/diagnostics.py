@@ -0,0 +1,171 @@
+from bot import bot, discord
+from utils.mongodb import explain_hot_queries, mongo, smdb, run_redis
+from commands.practice.lifecycle import key_stats, sweeper
+from utils.metrics import metrics, profiler, watchdog
+import io
+from utils.roles import is_moderator, is_bot_developer
+
+
+@bot.slash_command(
+    name="index_check",
+    description="Check which of the bot's frequent queries still scan whole collections",
+)
+async def index_check(interaction: discord.Interaction):
+    if not await is_moderator(interaction.user) and not await is_bot_developer(
+        interaction.user
+    ):
+        await interaction.send(
+            "You are not authorized to perform this action.", ephemeral=True
+        )
+        return
+    await interaction.response.defer(ephemeral=True)
+
+    results = await explain_hot_queries()
+    collscans = [result for result in results if result["collscan"]]
+
+    embed = discord.Embed(
+        title="Query Plan Check",
+        description=f"{len(results) - len(collscans)}/{len(results)} queries use an index.",
+        colour=discord.Colour.red() if collscans else discord.Colour.green(),
+    )
+    for result in results:
+        sort = f" sort {dict(result['sort'])}" if result["sort"] else ""
+        embed.add_field(
+            name=f"{'❌' if result['collscan'] else '✅'} {result['collection']}",
+            value=f"`{list(result['query'].keys())}{sort}`\n{', '.join(sorted(result['stages']))}",
+            inline=False,
+        )
+    await interaction.send(embed=embed, ephemeral=True)
+
+
+@bot.slash_command(
+    name="pool_stats",
+    description="Show connection pool usage for the shared MongoDB client",
+)
+async def pool_stats(interaction: discord.Interaction):
+    if not await is_moderator(interaction.user) and not await is_bot_developer(
+        interaction.user
+    ):
+        await interaction.send(
+            "You are not authorized to perform this action.", ephemeral=True
+        )
+        return
+
+    stats = mongo.metrics.stats()
+    embed = discord.Embed(title="MongoDB Pool", colour=discord.Colour.blurple())
+    for name, value in stats.items():
+        embed.add_field(name=name.replace("_", " ").title(), value=str(value))
+    embed.set_footer(text=f"{bot.user}", icon_url=bot.user.display_avatar.url)
+    await interaction.send(embed=embed, ephemeral=True)
+
+
+def prometheus_dump() -> str:
+    lines = [metrics.prometheus(), "# TYPE igcsebot_mongo_pool gauge"]
+    for name, value in mongo.metrics.stats().items():
+        lines.append(f'igcsebot_mongo_pool{{stat="{name}"}} {value}')
+    lines.append("# TYPE igcsebot_sticky_sync_documents gauge")
+    for name, value in smdb.last_sync.items():
+        lines.append(f'igcsebot_sticky_sync_documents{{stat="{name}"}} {value}')
+    lines.append("# TYPE igcsebot_slow_callbacks_total counter")
+    lines.append(f"igcsebot_slow_callbacks_total {watchdog.slow_callbacks}")
+    lines.append("# TYPE igcsebot_practice_sweep_keys gauge")
+    for name, value in sweeper.last_sweep.items():
+        lines.append(f'igcsebot_practice_sweep_keys{{stat="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+@bot.slash_command(
+    name="botstats",
+    description="Show latency and error stats for the bot's handlers",
+)
+async def botstats(
+    interaction: discord.Interaction,
+    view: str = discord.SlashOption(
+        name="view",
+        description="What to show (default: summary)",
+        choices=["summary", "prometheus", "profile", "redis"],
+        required=False,
+        default="summary",
+    ),
+):
+    if not await is_moderator(interaction.user) and not await is_bot_developer(
+        interaction.user
+    ):
+        await interaction.send(
+            "You are not authorized to perform this action.", ephemeral=True
+        )
+        return
+
+    if view == "prometheus":
+        file = discord.File(
+            io.BytesIO(prometheus_dump().encode()), filename="botstats.prom"
+        )
+        await interaction.send(file=file, ephemeral=True)
+        return
+
+    if view == "profile":
+        if not profiler.samples:
+            await interaction.send(
+                "The profiler is off. Set PROFILER_INTERVAL_MS to enable it.",
+                ephemeral=True,
+            )
+            return
+        file = discord.File(
+            io.BytesIO(profiler.folded().encode()), filename="profile.folded"
+        )
+        await interaction.send(file=file, ephemeral=True)
+        return
+
+    if view == "redis":
+        embed = discord.Embed(
+            title="Redis Keys",
+            description="Keys and memory used by each model.",
+            colour=discord.Colour.blurple(),
+        )
+        for model, stats in (await run_redis(key_stats)).items():
+            embed.add_field(
+                name=model,
+                value=f"{stats['keys']} keys, {stats['bytes'] / 1024:.1f} KiB",
+            )
+        sweep = sweeper.last_sweep
+        embed.add_field(
+            name="Last sweep",
+            value=", ".join(f"{value} {name}" for name, value in sweep.items()),
+            inline=False,
+        )
+        embed.set_footer(text=f"{bot.user}", icon_url=bot.user.display_avatar.url)
+        await interaction.send(embed=embed, ephemeral=True)
+        return
+
+    slowest = sorted(
+        metrics.handlers.items(),
+        key=lambda item: item[1].quantiles()[0.95],
+        reverse=True,
+    )[:20]
+    embed = discord.Embed(
+        title="Bot Stats",
+        description="Slowest handlers by p95 latency.",
+        colour=discord.Colour.blurple(),
+    )
+    for name, stats in slowest:
+        p50, p95, p99 = (value * 1000 for value in stats.quantiles().values())
+        waits = ", ".join(
+            f"{backend} {waited / stats.count * 1000:.0f}"
+            for backend, waited in stats.waits.items()
+            if waited
+        )
+        embed.add_field(
+            name=name,
+            value=f"{stats.count} calls, {stats.errors} errors\n"
+            f"p50/p95/p99: {p50:.0f}/{p95:.0f}/{p99:.0f} ms"
+            + (f"\nawaiting (ms/call): {waits}" if waits else ""),
+            inline=False,
+        )
+    sync = smdb.last_sync
+    embed.add_field(
+        name="Sticky sync",
+        value=f"{sync['fetched']} fetched, {sync['saved']} saved, {sync['removed']} removed",
+        inline=False,
+    )
+    embed.set_footer(text=f"{bot.user}", icon_url=bot.user.display_avatar.url)
+    await interaction.send(embed=embed, ephemeral=True)
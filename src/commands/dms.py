@@ -8,7 +8,7 @@ async def send_dm(member: discord.Member, **kwargs):
     try:
         await member.send(**kwargs)
     except Exception:
-        guild = bot.get_channel(gpdb.get_pref("closed_dm_channel", member.guild.id)) 
+        guild = bot.get_channel(await gpdb.get_pref("closed_dm_channel", member.guild.id)) 
         if guild:
             thread = await dmsdb.get_thread(member)
             await thread.send(**kwargs, content=member.mention)
@@ -1,5 +1,5 @@
 from bot import bot, discord, time, pymongo
-from utils.constants import GUILD_ID, LINK, FORCED_MUTE_ROLE, MODLOG_CHANNEL_ID
+from utils.constants import GUILD_ID, FORCED_MUTE_ROLE, MODLOG_CHANNEL_ID
 from utils.roles import (
     has_role,
     get_role,
@@ -10,7 +10,8 @@ from utils.roles import (
 )
 from pytimeparse import parse
 from typing import Optional
-from utils.mongodb import gpdb
+from utils.mongodb import gpdb, get_db
+from utils.scheduler import scheduler
 
 
 @bot.slash_command(
@@ -30,12 +31,11 @@ async def gostudy(
     ),
 ):
 
-    client = pymongo.MongoClient(LINK)
-    db = client.IGCSEBot
+    db = get_db()
     mute = db["mute"]
     timern = int(time.time()) + 1
     channel = interaction.channel
-    mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", interaction.guild.id)) 
+    mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", interaction.guild.id)) 
     if mod_log_channel:
         forced_mute_role = interaction.guild.get_role(FORCED_MUTE_ROLE)
         time_to_mute = 3600
@@ -109,6 +109,7 @@ async def gostudy(
                         "muted": True,
                     }
                 )
+                scheduler.schedule(unmute_time, "mute", timern)
 
             proceedBTN.callback = proceedCallBack
 
@@ -161,6 +162,7 @@ async def gostudy(
                         "muted": True,
                     }
                 )
+                scheduler.schedule(unmute_time, "mute", timern)
                 await message.delete()
                 await user.add_roles(forced_mute_role)
                 embed = discord.Embed(
@@ -221,13 +223,12 @@ async def remove_gostudy(
         )
         return
 
-    client = pymongo.MongoClient(LINK)
-    db = client.IGCSEBot
+    db = get_db()
     mute = db["mute"]
     guild = bot.get_guild(GUILD_ID)
     timern = int(time.time()) + 1
     forced_mute_role = guild.get_role(FORCED_MUTE_ROLE)
-    mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", interaction.guild.id)) 
+    mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", interaction.guild.id)) 
     if mod_log_channel:
         if user is None:
             user_id = interaction.user.id
@@ -1,7 +1,7 @@
 from bot import discord, bot, pymongo
-from utils.constants import GUILD_ID, LINK, HOTM_VOTING_CHANNEL
+from utils.constants import GUILD_ID, HOTM_VOTING_CHANNEL
 from utils.roles import is_helper, is_moderator
-from utils.mongodb import gpdb
+from utils.mongodb import gpdb, get_db
 
 
 @bot.slash_command(description="Vote for the helper of the month", guild_ids=[GUILD_ID])
@@ -15,8 +15,7 @@ async def votehotm(
         await interaction.send("You can't vote for a bot.", ephemeral=True)
     elif await is_helper(helper):
         await interaction.response.defer(ephemeral=True)
-        client = pymongo.MongoClient(LINK)
-        db = client.IGCSEBot
+        db = get_db()
         helpers = db.hotmhelpers
         voters = db.hotmvoters
 
@@ -39,7 +38,7 @@ async def votehotm(
         )
 
         helpers.update_one({"id": helper.id}, {"$inc": {"votes": 1}}, upsert=True)
-        hotm_log_channel = bot.get_channel(gpdb.get_pref("hotm_results_channel", interaction.guild.id)) 
+        hotm_log_channel = bot.get_channel(await gpdb.get_pref("hotm_results_channel", interaction.guild.id)) 
         if hotm_log_channel:
             await hotm_log_channel.send(
                 f"{interaction.user} ({interaction.user.id}) has voted for {helper} ({helper.id})"
@@ -47,12 +46,12 @@ async def votehotm(
 
         messages = [
             msg
-            for msg in await bot.get_channel(gpdb.get_pref("hotm_results_channel", interaction.guild.id)).history().flatten()
+            for msg in await bot.get_channel(await gpdb.get_pref("hotm_results_channel", interaction.guild.id)).history().flatten()
             if msg.author.id == bot.user.id
             and msg.content == "HOTM Voting Results"
         ]
         if len(messages) == 0:
-            results_message = await bot.get_channel(gpdb.get_pref("hotm_results_channel", interaction.guild.id)).send(
+            results_message = await bot.get_channel(await gpdb.get_pref("hotm_results_channel", interaction.guild.id)).send(
                 content="HOTM Voting Results"
             )
         else:
@@ -88,13 +87,12 @@ async def resethotm(interaction: discord.Interaction):
         )
         return
     await interaction.response.defer(ephemeral=True)
-    client = pymongo.MongoClient(LINK)
-    db = client.IGCSEBot
+    db = get_db()
     db.drop_collection("hotmhelpers")
     db.drop_collection("hotmvoters")
     msgs = [
         msg
-        for msg in await bot.get_channel(gpdb.get_pref("hotm_results_channel", interaction.guild.id)).history().flatten()
+        for msg in await bot.get_channel(await gpdb.get_pref("hotm_results_channel", interaction.guild.id)).history().flatten()
         if msg.author.id == bot.user.id and msg.content == "HOTM Voting Results"
     ]
     await msgs[0].delete()
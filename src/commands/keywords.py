@@ -25,13 +25,13 @@ class AddKeywords(discord.ui.Modal):
         self.add_item(self.autoresponse)
 
     async def callback(self, interaction: discord.Interaction):
-        mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", interaction.guild.id)) 
+        mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", interaction.guild.id)) 
         if mod_log_channel:
             timern = int(time.time()) + 1
-            kwdb.add_keyword(
+            await kwdb.add_keyword(
                 self.keyword.value, self.autoresponse.value, interaction.guild.id
             )
-            keywords[interaction.guild.id] = kwdb.get_keywords(interaction.guild.id)
+            keywords[interaction.guild.id] = await kwdb.get_keywords(interaction.guild.id)
             embed = discord.Embed(
                 description="Keyword Created", colour=discord.Colour.green()
             )
@@ -71,11 +71,11 @@ class RemoveKeywords(discord.ui.Modal):
         self.add_item(self.keyword)
 
     async def callback(self, interaction: discord.Interaction):
-        mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", interaction.guild.id)) 
+        mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", interaction.guild.id)) 
         if mod_log_channel:
             timern = int(time.time()) + 1
-            kwdb.remove_keyword(self.keyword.value, interaction.guild.id)
-            keywords[interaction.guild.id] = kwdb.get_keywords(interaction.guild.id)
+            await kwdb.remove_keyword(self.keyword.value, interaction.guild.id)
+            keywords[interaction.guild.id] = await kwdb.get_keywords(interaction.guild.id)
             embed = discord.Embed(
                 description="Keyword Deleted", colour=discord.Colour.green()
             )
@@ -120,7 +120,7 @@ async def list_keywords(interaction: discord.Interaction):
     page = 1
 
     await interaction.response.defer()
-    keywords = kwdb.keyword_list(interaction.guild.id)
+    keywords = await kwdb.keyword_list(interaction.guild.id)
     keywords = [item.values() for item in keywords]
     chunks = [list(keywords)[x : x + 9] for x in range(0, len(keywords), 9)]
 
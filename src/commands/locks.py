@@ -1,6 +1,7 @@
 from bot import bot, discord, pymongo, time
-from utils.constants import LINK, GUILD_ID, MODLOG_CHANNEL_ID
-from utils.mongodb import gpdb
+from utils.constants import GUILD_ID, MODLOG_CHANNEL_ID
+from utils.mongodb import gpdb, get_db
+from utils.scheduler import scheduler
 from utils.roles import is_moderator
 
 
@@ -36,8 +37,7 @@ async def Channellockcommand(
         return
 
     if locktime == "resolveall" and unlocktime == "!@#$%^&*()":
-        client = pymongo.MongoClient(LINK)
-        db = client.IGCSEBot
+        db = get_db()
         locks = db["channellock"]
         results = locks.find({"resolved": False})
         for result in results:
@@ -100,7 +100,7 @@ async def Channellockcommand(
 
     # user_id = f"<@{interaction.user.id}>"
     channel_id = f"<#{channelinput.id}>"
-    mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", interaction.guild.id)) 
+    mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", interaction.guild.id)) 
     if mod_log_channel:
         embed = discord.Embed(
             description="Scheduled Channel Lockdown", colour=discord.Colour.red()
@@ -120,8 +120,7 @@ async def Channellockcommand(
         embed.set_footer(text=f"{bot.user}", icon_url=bot.user.display_avatar.url)
         await mod_log_channel.send(embed=embed)
 
-    client = pymongo.MongoClient(LINK)
-    db = client.IGCSEBot
+    db = get_db()
     locks = db["channellock"]
 
     locks.insert_one(
@@ -145,6 +144,8 @@ async def Channellockcommand(
             "resolved": False,
         }
     )
+    scheduler.schedule(locktime, "channellock", "l" + str(timenow))
+    scheduler.schedule(unlocktime, "channellock", "u" + str(timenow))
 
     await channelinput.send(
         f"This channel has been scheduled to lock <t:{max(locktime, timenow)}:R>."
@@ -187,8 +188,7 @@ async def Forumlockcommand(
         unlocktime = time.time() + 5
 
     if locktime == "resolveall" and unlocktime == "!@#$%^&*()":
-        client = pymongo.MongoClient(LINK)
-        db = client.IGCSEBot
+        db = get_db()
         locks = db["forumlock"]
         results = locks.find({"resolved": False})
         for result in results:
@@ -246,7 +246,7 @@ async def Forumlockcommand(
 
     # user_id = f"<@{interaction.user.id}>"
     thread_id = f"<#{threadinput.id}>"
-    mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", interaction.guild.id)) 
+    mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", interaction.guild.id)) 
     if mod_log_channel:
         embed = discord.Embed(
             description="Scheduled Forum Lockdown", colour=discord.Colour.red()
@@ -266,8 +266,7 @@ async def Forumlockcommand(
         embed.set_footer(text=f"{bot.user}", icon_url=bot.user.display_avatar.url)
         await mod_log_channel.send(embed=embed)
 
-    client = pymongo.MongoClient(LINK)
-    db = client.IGCSEBot
+    db = get_db()
     lock = db["forumlock"]
 
     lock.insert_many(
@@ -290,6 +289,8 @@ async def Forumlockcommand(
             },
         ]
     )
+    scheduler.schedule(locktime, "forumlock", "l" + str(timenow))
+    scheduler.schedule(unlocktime, "forumlock", "u" + str(timenow))
 
     await threadinput.send(
         f"this thread has been scheduled to lock <t:{max(locktime, timenow)}:R> successfully."
@@ -3,7 +3,8 @@ from commands.dms import send_dm
 from utils.bans import is_banned
 from utils.roles import is_chat_moderator, is_moderator, is_admin
 from utils.mongodb import gpdb, punishdb
-from utils.constants import GUILD_ID
+from utils.members import member_names
+from utils.constants import GUILD_ID, INFRACTION_REPORT_THRESHOLD
 
 
 def convert_time(time: tuple[str, str, str, str]) -> str:
@@ -17,6 +18,106 @@ def convert_time(time: tuple[str, str, str, str]) -> str:
     return time_str.strip()
 
 
+HISTORY_PAGE_SIZE = 10
+ACTIONS_COUNTED_AS_OFFENCES = ["Warn", "Timeout", "Mute", "Ban", "Kick"]
+
+
+async def render_history(
+    guild: discord.Guild, user: discord.User, page: int
+) -> tuple[str | None, int]:
+    """The history text for one page and the number of pages."""
+    history = await punishdb.get_history_page(
+        user.id, guild.id, page, HISTORY_PAGE_SIZE
+    )
+    if not history["rows"]:
+        return None, 0
+    pages = -(-history["rows"] // HISTORY_PAGE_SIZE)
+
+    # Moderators are stored by ID, or by name for older and automod entries.
+    moderator_ids = {
+        int(action_by)
+        for action_by in (result["action_by"].strip() for result in history["page"])
+        if action_by.isdecimal()
+    }
+    moderators = await member_names(guild, moderator_ids)
+
+    lines = []
+    for result in history["page"]:
+        if isinstance(result["when"], datetime.datetime):
+            date_of_event = result["when"].strftime("%d %b, %Y at %I:%M %p")
+        else:
+            date_of_event = datetime.datetime.fromisoformat(
+                str(result["when"])
+            ).strftime("%d %b, %Y at %I:%M %p")
+        duration_as_text = (
+            f" ({result['duration']})" if result["action"] == "Timeout" else ""
+        )
+        reason = f" for {result['reason']}" if result["reason"] else ""
+        action_by = result["action_by"].strip()
+        moderator = (
+            moderators.get(int(action_by), action_by)
+            if action_by.isdecimal()
+            else action_by
+        )
+        lines.append(
+            f"[{date_of_event}] [{result.get('points', 0)}] {result['action']}{duration_as_text}{reason} by {moderator}"
+        )
+
+    actions = sorted(history["actions"].items(), key=lambda x: x[1], reverse=True)
+    total = sum(
+        count for action, count in actions if action in ACTIONS_COUNTED_AS_OFFENCES
+    )
+    points = history["points"]
+    points_message = (
+        " (Action needed)" if points >= INFRACTION_REPORT_THRESHOLD else ""
+    )
+
+    text = f"Moderation History for {user}:\n\nNo. of offences ({total}):\n"
+    text += "\n".join(f"{action}: {count}" for action, count in actions)
+    text += "\n"
+    text += f"\nFurther Details (page {page + 1}/{pages}, newest first):\n"
+    text += ("\n".join(lines))[:1500]
+    text += f"\n\nTotal Points: {points}{points_message}"
+    return f"```{text}```", pages
+
+
+class HistoryView(discord.ui.View):
+    def __init__(self, author: discord.Member, user: discord.User, pages: int):
+        super().__init__(timeout=300)
+        self.author = author
+        self.user = user
+        self.page = 0
+        self.pages = pages
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page >= self.pages - 1
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author.id
+
+    async def show(self, interaction: discord.Interaction, page: int):
+        self.page = page
+        text, self.pages = await render_history(interaction.guild, self.user, page)
+        self.page = min(self.page, max(self.pages - 1, 0))
+        self.update_buttons()
+        await interaction.response.edit_message(
+            content=text or f"{self.user} does not have any previous offenses.",
+            view=self,
+        )
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.grey)
+    async def previous(
+        self, button: discord.ui.Button, interaction: discord.Interaction
+    ):
+        await self.show(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.grey)
+    async def next(self, button: discord.ui.Button, interaction: discord.Interaction):
+        await self.show(interaction, self.page + 1)
+
+
 @bot.slash_command(description="Check a user's previous offenses (warns/timeouts/bans)")
 async def history(
     interaction: discord.Interaction,
@@ -32,65 +133,18 @@ async def history(
         )
         return
     await interaction.response.defer()
-    actions = {}
-    history = []
-    total = 0
-    allowed_actions_for_total = ["Warn", "Timeout", "Mute", "Ban", "Kick"]
-    results = punishdb.get_punishments_by_user(user.id, interaction.guild.id)
-    points = 0
-    for result in results:
-        if result["action"] not in actions:
-            actions[result["action"]] = 1
-        else:
-            actions[result["action"]] += 1
+    text, pages = await render_history(interaction.guild, user, 0)
 
-        if result["action"] in allowed_actions_for_total:
-            total += 1
-
-        points += result.get("points", 0)
-
-        if isinstance(result["when"], datetime.datetime):
-            date_of_event = result["when"].strftime("%d %b, %Y at %I:%M %p")
-        else:
-            date_of_event = datetime.datetime.fromisoformat(
-                str(result["when"])
-            ).strftime("%d %b, %Y at %I:%M %p")
-        duration_as_text = (
-            f" ({result['duration']})" if result["action"] == "Timeout" else ""
-        )
-
-        reason = f" for {result['reason']}" if result["reason"] else ""
-
-        try:
-            if "#" not in result["action_by"] and result["action_by"].isnumeric():
-                moderator = interaction.guild.get_member(
-                    int(result["action_by"])
-                ) or await interaction.guild.fetch_member(int(result["action_by"]))
-                moderator = moderator.name
-            else:
-                moderator = result["action_by"].strip()
-        except discord.errors.NotFound:
-            moderator = result["action_by"].strip()
-
-        final_string = f"[{date_of_event}] [{result.get('points', 0)}] {result['action']}{duration_as_text}{reason} by {moderator.strip()}"
-        history.append(final_string)
-
-    if len(history) == 0:
+    if not text:
         await interaction.send(
             f"{user} does not have any previous offenses.", ephemeral=False
         )
+    elif pages == 1:
+        await interaction.send(text, ephemeral=False)
     else:
-        points_message = ""
-        if points >= 10:
-            points_message = " (Action needed)"
-
-        text = f"Moderation History for {user}:\n\nNo. of offences ({total}):\n"
-        text += "\n".join(list(map(lambda x: f"{x[0]}: {x[1]}", list(actions.items()))))
-        text += "\n"
-        text += "\nFurther Details:\n"
-        text += ("\n".join(history))[:1900]
-        text += f"\n\nTotal Points: {points}{points_message}"
-        await interaction.send(f"```{text}```", ephemeral=False)
+        await interaction.send(
+            text, view=HistoryView(interaction.user, user, pages), ephemeral=False
+        )
 
 
 @bot.slash_command(description="Warn a user (for mods)")
@@ -118,23 +172,10 @@ async def warn(
         )
         return
     await interaction.response.defer()
-    warnlog_channel = gpdb.get_pref("warnlog_channel", interaction.guild.id)
+    case_no = await punishdb.next_case_id(interaction.guild.id)
+    warnlog_channel = await gpdb.get_pref("warnlog_channel", interaction.guild.id)
     if warnlog_channel:
         ban_msg_channel = bot.get_channel(warnlog_channel)
-        try:
-            last_ban_msg = await ban_msg_channel.history(limit=1).flatten()
-            case_no = (
-                int(
-                    "".join(
-                        list(
-                            filter(str.isdigit, last_ban_msg[0].content.splitlines()[0])
-                        )
-                    )
-                )
-                + 1
-            )
-        except Exception:
-            case_no = 1
         ban_msg = f"""Case #{case_no} | [{action_type}]\nUsername: {str(user)} ({user.id})\nModerator: {mod} \nReason: {reason}"""
         await interaction.send(f"{str(user)} has been warned.")
         await ban_msg_channel.send(ban_msg)
@@ -147,7 +188,7 @@ async def warn(
         user,
         embed=embed,
     )
-    punishdb.add_punishment(
+    await punishdb.add_punishment(
         case_no,
         user.id,
         interaction.user.id,
@@ -215,23 +256,10 @@ async def timeout(
     await user.edit(timeout=datetime.timedelta(seconds=seconds))
     human_readable_time = f"{seconds // 86400}d {(seconds % 86400) // 3600}h {(seconds % 3600) // 60}m {seconds % 60}s"
     ban_msg_channel = bot.get_channel(
-        gpdb.get_pref("behavior_log_channel", interaction.guild.id)
+        await gpdb.get_pref("behavior_log_channel", interaction.guild.id)
     )
+    case_no = await punishdb.next_case_id(interaction.guild.id)
     if ban_msg_channel:
-        try:
-            last_ban_msg = await ban_msg_channel.history(limit=1).flatten()
-            case_no = (
-                int(
-                    "".join(
-                        list(
-                            filter(str.isdigit, last_ban_msg[0].content.splitlines()[0])
-                        )
-                    )
-                )
-                + 1
-            )
-        except Exception:
-            case_no = 1
         ban_msg = f"""Case #{case_no} | [{action_type}]
 Username: {str(user)} ({user.id})
 Moderator: {mod}
@@ -263,7 +291,7 @@ Until: <t:{int(time.time()) + seconds}> (<t:{int(time.time()) + seconds}:R>)"""
     if seconds >= (3600 * 24 * 7):
         points = 4
 
-    punishdb.add_punishment(
+    await punishdb.add_punishment(
         case_no,
         user.id,
         interaction.user.id,
@@ -298,34 +326,21 @@ async def untimeout(
     await interaction.response.defer()
     await user.edit(timeout=None)
     ban_msg_channel = bot.get_channel(
-        gpdb.get_pref("behavior_log_channel", interaction.guild.id)
+        await gpdb.get_pref("behavior_log_channel", interaction.guild.id)
     )
+    case_no = await punishdb.next_case_id(interaction.guild.id)
     if ban_msg_channel:
-        try:
-            last_ban_msg = await ban_msg_channel.history(limit=1).flatten()
-            case_no = (
-                int(
-                    "".join(
-                        list(
-                            filter(str.isdigit, last_ban_msg[0].content.splitlines()[0])
-                        )
-                    )
-                )
-                + 1
-            )
-        except Exception:
-            case_no = 1
         ban_msg = f"""Case #{case_no} | [{action_type}]
 Username: {str(user)} ({user.id})
 Moderator: {mod}"""
         await ban_msg_channel.send(ban_msg)
     await interaction.send(f"Timeout has been removed from {str(user)}.")
-    punishments = list(punishdb.get_punishments_by_user(user.id, interaction.guild.id))
+    punishments = list(await punishdb.get_punishments_by_user(user.id, interaction.guild.id))
     points = 0
     if punishments and punishments[-1]:
         if punishments[-1]["action"] == "Timeout":
             points = -punishments[-1]["points"]
-    punishdb.add_punishment(
+    await punishdb.add_punishment(
         case_no,
         user.id,
         interaction.user.id,
@@ -368,28 +383,15 @@ async def kick(
     except Exception:
         pass
     ban_msg_channel = bot.get_channel(
-        gpdb.get_pref("behavior_log_channel", interaction.guild.id)
+        await gpdb.get_pref("behavior_log_channel", interaction.guild.id)
     )
+    case_no = await punishdb.next_case_id(interaction.guild.id)
     if ban_msg_channel:
-        try:
-            last_ban_msg = await ban_msg_channel.history(limit=1).flatten()
-            case_no = (
-                int(
-                    "".join(
-                        list(
-                            filter(str.isdigit, last_ban_msg[0].content.splitlines()[0])
-                        )
-                    )
-                )
-                + 1
-            )
-        except Exception:
-            case_no = 1
         ban_msg = f"""Case #{case_no} | [{action_type}]\nUsername: {str(user)} ({user.id})\nModerator: {mod} \nReason: {reason}"""
         await ban_msg_channel.send(ban_msg)
     await interaction.guild.kick(user)
     await interaction.send(f"{str(user)} has been kicked.")
-    punishdb.add_punishment(
+    await punishdb.add_punishment(
         case_no, user.id, interaction.user.id, reason, action_type, interaction.guild.id
     )
 
@@ -455,28 +457,15 @@ async def ban(
     except Exception:
         pass
     ban_msg_channel = bot.get_channel(
-        gpdb.get_pref("behavior_log_channel", interaction.guild.id)
+        await gpdb.get_pref("behavior_log_channel", interaction.guild.id)
     )
+    case_no = await punishdb.next_case_id(interaction.guild.id)
     if ban_msg_channel:
-        try:
-            last_ban_msg = await ban_msg_channel.history(limit=1).flatten()
-            case_no = (
-                int(
-                    "".join(
-                        list(
-                            filter(str.isdigit, last_ban_msg[0].content.splitlines()[0])
-                        )
-                    )
-                )
-                + 1
-            )
-        except Exception:
-            case_no = 1
         ban_msg = f"""Case #{case_no} | [{action_type}]\nUsername: {str(user)} ({user.id})\nModerator: {mod} \nReason: {reason}"""
         await ban_msg_channel.send(ban_msg)
     await interaction.guild.ban(user, delete_message_days=delete_message_days)
     await interaction.send(f"{str(user)} has been banned.")
-    punishdb.add_punishment(
+    await punishdb.add_punishment(
         case_no, user.id, interaction.user.id, reason, action_type, interaction.guild.id
     )
 
@@ -501,26 +490,13 @@ async def unban(
     await interaction.send(f"{str(user)} has been unbanned.")
 
     ban_msg_channel = bot.get_channel(
-        gpdb.get_pref("behavior_log_channel", interaction.guild.id)
+        await gpdb.get_pref("behavior_log_channel", interaction.guild.id)
     )
+    case_no = await punishdb.next_case_id(interaction.guild.id)
     if ban_msg_channel:
-        try:
-            last_ban_msg = await ban_msg_channel.history(limit=1).flatten()
-            case_no = (
-                int(
-                    "".join(
-                        list(
-                            filter(str.isdigit, last_ban_msg[0].content.splitlines()[0])
-                        )
-                    )
-                )
-                + 1
-            )
-        except Exception:
-            case_no = 1
         ban_msg = f"""Case #{case_no} | [{action_type}]\nUsername: {str(user)} ({user.id})\nModerator: {mod}"""
         await ban_msg_channel.send(ban_msg)
-        punishdb.add_punishment(
+        await punishdb.add_punishment(
             case_no, user.id, interaction.user.id, "", action_type, interaction.guild.id
         )
 
@@ -555,7 +531,7 @@ class PunishmentsView(discord.ui.View):
             )
             return
 
-        punishdb.remove_punishment(self.select.values[0])
+        await punishdb.remove_punishment(self.select.values[0])
 
         await interaction.edit(content="Punishment removed!", view=None)
         for child in self.children:
@@ -583,7 +559,7 @@ async def remove_infraction(
         )
         return
     await interaction.response.defer(ephemeral=True)
-    results = punishdb.get_punishments_by_user(user.id, interaction.guild.id)
+    results = await punishdb.get_punishments_by_user(user.id, interaction.guild.id)
     results = list(results)
     if len(results) == 0:
         await interaction.send(f"{user} does not have any previous offenses.")
@@ -591,3 +567,19 @@ async def remove_infraction(
 
     view = PunishmentsView(results)
     await interaction.send(view=view, ephemeral=True)
+
+
+@bot.slash_command(
+    description="Recompute everyone's infraction points from their history (for admins)"
+)
+async def rebuild_infraction_points(interaction: discord.Interaction):
+    if not await is_admin(interaction.user):
+        await interaction.send(
+            "You are not permitted to use this command.", ephemeral=True
+        )
+        return
+    await interaction.response.defer(ephemeral=True)
+    users = await punishdb.rebuild_infraction_totals(interaction.guild.id)
+    await interaction.send(
+        f"Rebuilt infraction points for {users} users.", ephemeral=True
+    )
@@ -1,3 +1,5 @@
 from .practice import (
     close_session,
+    dispatch_idle_sessions,
 )
+from .components import answer_mcq
@@ -0,0 +1,87 @@
+from typing import NamedTuple
+from schemas.redis import Question, Session
+from .queue import QuestionQueue
+import json
+
+# Records one answer and, if it was the last one missing, marks the question
+# solved, frees the session and moves the queue on, all atomically.
+# KEYS: question, session, queue cursor. ARGV: user id, answer, question name.
+RECORD_ANSWER = """
+local session = redis.call("JSON.GET", KEYS[2], "$")
+if not session then
+    return {"no_session"}
+end
+session = cjson.decode(session)[1]
+
+local participants = {session.started_by}
+for _, user in ipairs(session.users) do
+    table.insert(participants, user)
+end
+local member = false
+for _, user in ipairs(participants) do
+    if user == ARGV[1] then
+        member = true
+    end
+end
+if not member then
+    return {"not_in_session"}
+end
+if session.currently_solving ~= ARGV[3] then
+    return {"not_current"}
+end
+
+local path = '$.user_answers["' .. ARGV[1] .. '"]'
+if not redis.call("JSON.SET", KEYS[1], path, cjson.encode(ARGV[2]), "NX") then
+    return {"already_answered"}
+end
+
+local question = cjson.decode(redis.call("JSON.GET", KEYS[1], "$"))[1]
+local solved = 1
+for _, user in ipairs(participants) do
+    if question.user_answers[user] == nil then
+        solved = 0
+    end
+end
+if solved == 1 then
+    redis.call("JSON.SET", KEYS[1], "$.solved", "1")
+    redis.call("JSON.SET", KEYS[2], "$.currently_solving", '"none"')
+    redis.call("INCR", KEYS[3])
+end
+return {"ok", solved, cjson.encode(question.user_answers), cjson.encode(question.answers)}
+"""
+
+
+class AnswerResult(NamedTuple):
+    status: str
+    solved: bool = False
+    user_answers: dict[str, str] = {}
+    answers: str | list[str] = ""
+
+
+record_answer_script = None
+
+
+def record_answer(question_name: str, user_id: str, answer: str) -> AnswerResult:
+    global record_answer_script
+    if record_answer_script is None:
+        record_answer_script = Question.db().register_script(RECORD_ANSWER)
+
+    # Question names end with the ID of the session they belong to.
+    session_id = question_name.rsplit("_", 1)[1]
+    result = record_answer_script(
+        keys=[
+            Question.make_primary_key(question_name),
+            Session.make_primary_key(session_id),
+            QuestionQueue(session_id).cursor_key,
+        ],
+        args=[user_id, answer, question_name],
+    )
+    result = [x.decode() if isinstance(x, bytes) else x for x in result]
+    if result[0] != "ok":
+        return AnswerResult(result[0])
+    return AnswerResult(
+        status="ok",
+        solved=bool(result[1]),
+        user_answers=json.loads(result[2]),
+        answers=json.loads(result[3]),
+    )
@@ -0,0 +1,69 @@
+from bot import bot, discord
+from .answers import record_answer
+from .ui.DisabledButtonsView import DisabledButtonsView
+from utils.mongodb import run_redis
+from utils.metrics import metrics
+import re
+
+# MCQ buttons carry "<question_name>_<option>" as their custom ID, where the
+# question name ends with the 8 character ID of its session.
+MCQ_CUSTOM_ID = re.compile(
+    r"\A(?P<question_name>\w+_qp_\w+_q\d+_[0-9a-f]{8})_(?P<option>[A-D])\Z"
+)
+
+
+@metrics.timed("component:mcq")
+async def answer_mcq(
+    interaction: discord.Interaction, question_name: str, option: str
+):
+    result = await run_redis(
+        record_answer, question_name, str(interaction.user.id), option
+    )
+
+    if result.status in ("no_session", "not_in_session"):
+        await interaction.response.send_message(
+            "You are not in this session.", ephemeral=True
+        )
+        return
+    if result.status == "not_current":
+        await interaction.response.send_message(
+            "This question is no longer being solved.", ephemeral=True
+        )
+        return
+    if result.status == "already_answered":
+        await interaction.response.send_message(
+            "You have already answered this question.", ephemeral=True
+        )
+        return
+
+    if option == result.answers:
+        await interaction.response.send_message("Correct!", ephemeral=True)
+    else:
+        await interaction.response.send_message("Incorrect!", ephemeral=True)
+
+    if result.solved:
+        thread = interaction.channel
+        embed = discord.Embed(title="Question solved!")
+        embed.description = (
+            f"Question: {question_name}\nCorrect answer: {result.answers}\n\n"
+        )
+        for user in result.user_answers.keys():
+            embed.description += f"<@{user}>: {result.user_answers[user]}\n"
+
+        await interaction.message.edit(view=DisabledButtonsView(result.answers))
+        await thread.send(embed=embed)
+        # Session IDs are the last part of question names.
+        interaction.client.dispatch(
+            "practice_question_solved", question_name.rsplit("_", 1)[1]
+        )
+
+
+@bot.listen("on_interaction")
+async def dispatch_components(interaction: discord.Interaction):
+    # Component clicks no stored view claimed end up here too; MCQ buttons are
+    # recognised by their custom ID alone.
+    if interaction.type != discord.InteractionType.component:
+        return
+    match = MCQ_CUSTOM_ID.match(interaction.data.get("custom_id", ""))
+    if match:
+        await answer_mcq(interaction, match["question_name"], match["option"])
@@ -0,0 +1,169 @@
+from schemas.redis import (
+    Session,
+    User,
+    TempSessionData,
+    Question,
+    View,
+    StickyMessage,
+)
+from utils.constants import PRACTICE_KEY_GRACE, TEMP_SESSION_TTL
+from .queue import QuestionQueue
+import time
+
+MODELS = (Session, Question, User, View, TempSessionData, StickyMessage)
+
+
+def session_ttl(session: Session) -> int:
+    return max(60, session["expire_time"] - int(time.time()) + PRACTICE_KEY_GRACE)
+
+
+def question_names(session_id: str) -> list[str]:
+    names = Question.db().lrange(QuestionQueue(session_id).key, 0, -1)
+    return [name.decode() if isinstance(name, bytes) else name for name in names]
+
+
+def expire_session_keys(session: Session):
+    """Lines up the TTL of every key a session owns with its expire_time.
+
+    Redis drops whatever close_session never got to (a crash, a deleted
+    thread) on its own. Re-saving a JSON document keeps its TTL, so this only
+    has to run when keys are created or people join.
+    """
+    ttl = session_ttl(session)
+    queue = QuestionQueue(session.session_id)
+    pipeline = Session.db().pipeline(transaction=False)
+    pipeline.expire(Session.make_primary_key(session.session_id), ttl)
+    pipeline.expire(queue.key, ttl)
+    pipeline.expire(queue.cursor_key, ttl)
+    for name in question_names(session.session_id):
+        pipeline.expire(Question.make_primary_key(name), ttl)
+    for user_id in [session["started_by"], *session["users"]]:
+        pipeline.expire(User.make_primary_key(user_id), ttl)
+    pipeline.execute()
+
+
+def purge_session(session: Session):
+    """Deletes a session and everything it owns without touching Discord."""
+    names = question_names(session.session_id)
+    names += [
+        question.question_name
+        for question in Question.find(
+            Question.session_id == session.session_id
+        ).all()
+        if question.question_name not in names
+    ]
+    queue = QuestionQueue(session.session_id)
+    pipeline = Session.db().pipeline(transaction=False)
+    for name in names:
+        pipeline.delete(Question.make_primary_key(name))
+    for user_id in [session["started_by"], *session["users"]]:
+        pipeline.delete(User.make_primary_key(user_id))
+    pipeline.delete(
+        Session.make_primary_key(session.session_id), queue.key, queue.cursor_key
+    )
+    pipeline.execute()
+
+
+def scan_keys(model, match: str | None = None) -> list[str]:
+    db = model.db()
+    return [
+        key.decode() if isinstance(key, bytes) else key
+        for key in db.scan_iter(
+            match=match or model.make_primary_key("*"), count=500
+        )
+    ]
+
+
+def scan_queue_keys() -> list[str]:
+    """Every question queue list and cursor, e.g. practice:queue:<id>:cursor."""
+    return scan_keys(Question, QuestionQueue("*").key)
+
+
+class OrphanSweeper:
+    """Removes practice keys that no live session owns.
+
+    Questions and users are saved a moment before their session, so a key
+    only counts as orphaned once two sweeps in a row have found it without a
+    session; the first sweep just marks it as a suspect.
+    """
+
+    def __init__(self):
+        self.suspects: set[str] = set()
+        self.last_sweep = dict.fromkeys(
+            ("sessions", "questions", "queues", "views", "users", "ttl_set"), 0
+        )
+
+    def orphans(self, model, is_live) -> list[str]:
+        prefix = len(model.make_primary_key(""))
+        return [key for key in scan_keys(model) if not is_live(key[prefix:])]
+
+    def sweep(self, live_sessions: dict[str, Session], purged: int = 0):
+        stats = dict.fromkeys(self.last_sweep, 0)
+        stats["sessions"] = purged
+        db = Session.db()
+
+        for session in live_sessions.values():
+            expire_session_keys(session)
+
+        members = {
+            user_id
+            for session in live_sessions.values()
+            for user_id in [session["started_by"], *session["users"]]
+        }
+        # Question names end with the ID of their session.
+        found = {
+            "questions": self.orphans(
+                Question, lambda name: name.rsplit("_", 1)[-1] in live_sessions
+            ),
+            "users": self.orphans(User, lambda user_id: user_id in members),
+            "queues": [
+                key
+                for key in scan_queue_keys()
+                if key.split(":")[2] not in live_sessions
+            ],
+        }
+        suspects = set()
+        for stat, keys in found.items():
+            doomed = [key for key in keys if key in self.suspects]
+            if doomed:
+                db.delete(*doomed)
+            stats[stat] = len(doomed)
+            suspects.update(key for key in keys if key not in self.suspects)
+        self.suspects = suspects
+
+        # View keys are no longer written; drop the ones older versions left.
+        views = scan_keys(View)
+        if views:
+            db.delete(*views)
+        stats["views"] = len(views)
+
+        keys = scan_keys(TempSessionData)
+        pipeline = db.pipeline(transaction=False)
+        for key in keys:
+            pipeline.ttl(key)
+        for key, ttl in zip(keys, pipeline.execute()):
+            if ttl == -1:
+                db.expire(key, TEMP_SESSION_TTL)
+                stats["ttl_set"] += 1
+
+        self.last_sweep = stats
+        return stats
+
+
+sweeper = OrphanSweeper()
+
+
+def key_stats() -> dict[str, dict[str, int]]:
+    """Number of keys and bytes of memory used by each Redis model."""
+    scans = {model.__name__: (model, scan_keys(model)) for model in MODELS}
+    scans["QuestionQueue"] = (Question, scan_queue_keys())
+    stats = {}
+    for name, (model, keys) in scans.items():
+        pipeline = model.db().pipeline(transaction=False)
+        for key in keys:
+            pipeline.memory_usage(key)
+        stats[name] = {
+            "keys": len(keys),
+            "bytes": sum(size or 0 for size in pipeline.execute()),
+        }
+    return stats
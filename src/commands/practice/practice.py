@@ -1,6 +1,6 @@
 from bot import bot, discord
 from redis_om import NotFoundError, Migrator
-from schemas.redis import Session, User, TempSessionData, ExtendedModel, Question, View
+from schemas.redis import Session, User, TempSessionData, ExtendedModel, Question
 from .ui import (
     GetUserInput,
     SelectMenuSubject,
@@ -9,11 +9,21 @@ from .ui import (
     SelectUsersView,
     JoinSessionListView,
     AddRemoveUserView,
+    MCQButtonsView,
 )
 from utils.mongodb import questionsdb
+from .queue import QuestionQueue
+from . import state
+from .lifecycle import expire_session_keys
+from utils.constants import TEMP_SESSION_TTL
 from utils.data import practice_subjects
+from utils.members import resolve_members
 import uuid
 import time
+import asyncio
+
+# One lock per session so a solve and a resume never send the same question twice.
+session_locks: dict[str, asyncio.Lock] = {}
 
 
 async def get_from_db(primary_key: str, db: ExtendedModel) -> bool:
@@ -36,12 +46,34 @@ async def save_questions(questions: list, session_id: str):
             questions,
         )
     )
-    for question in questions_mapped:
-        question.save()
+    QuestionQueue(session_id).create(questions_mapped)
 
     return questions_mapped
 
 
+async def build_scoreboard(
+    guild: discord.Guild,
+    description: str,
+    number_of_correct_answers: dict[str, int],
+    number_of_answers: dict[str, int],
+) -> list[discord.Embed]:
+    members = await resolve_members(
+        guild, [int(user) for user in number_of_correct_answers.keys()]
+    )
+
+    embeds = [discord.Embed(title="Session Ended!", description=description)]
+    for user in number_of_correct_answers.keys():
+        # An embed holds at most 25 fields.
+        if len(embeds[-1].fields) == 25:
+            embeds.append(discord.Embed())
+        member = members.get(int(user))
+        embeds[-1].add_field(
+            name=member.name if member else user,
+            value=f"{number_of_correct_answers[user]}/{number_of_answers[user]}",
+        )
+    return embeds
+
+
 async def close_session(session: Session, message: str):
     thread = bot.get_channel(int(session["thread_id"]))
 
@@ -53,7 +85,6 @@ async def close_session(session: Session, message: str):
     for question in questions:
         user_answers = question["user_answers"]
         correct_answer = question["answers"]
-        View.delete(question["question_name"])
         for user in user_answers.keys():
             if user not in number_of_answers.keys():
                 number_of_answers[user] = 0
@@ -75,34 +106,16 @@ async def close_session(session: Session, message: str):
             f" out of which only {len(solved_questions)} were solved by everyone"
         )
 
-    embeds = []
-    embed = discord.Embed(title="Session Ended!")
-    embed.description = f"This session had {len(questions)} questions{unsolved_message}.\nThe scores for each user are as follows:\n\n"
-    if len(number_of_correct_answers) > 25:
-        for i in range(len(number_of_correct_answers) // 25):
-            for user in list(number_of_correct_answers.keys())[i * 25 : (i + 1) * 25]:
-                if len(embeds) != 0:
-                    embed = discord.Embed()
-                member = thread.guild.get_member(
-                    int(user)
-                ) or await thread.guild.fetch_member(int(user))
-                embed.add_field(
-                    name=f"{member.name}",
-                    value=f"{number_of_correct_answers[user]}/{number_of_answers[user]}",
-                )
-            embeds.append(embed)
-    else:
-        for user in number_of_correct_answers.keys():
-            member = thread.guild.get_member(
-                int(user)
-            ) or await thread.guild.fetch_member(int(user))
-            embed.add_field(
-                name=f"{member.name}",
-                value=f"{number_of_correct_answers[user]}/{number_of_answers[user]}",
-            )
-        embeds.append(embed)
+    embeds = await build_scoreboard(
+        thread.guild,
+        f"This session had {len(questions)} questions{unsolved_message}.\nThe scores for each user are as follows:\n\n",
+        number_of_correct_answers,
+        number_of_answers,
+    )
 
-    await thread.send(embeds=embeds)
+    # A message can carry at most 10 embeds.
+    for i in range(0, len(embeds), 10):
+        await thread.send(embeds=embeds[i : i + 10])
     await thread.send(message)
 
     await thread.edit(archived=True, locked=True)
@@ -113,6 +126,78 @@ async def close_session(session: Session, message: str):
     User.delete(session["started_by"])
     Session.delete(session.session_id)
     Question.delete_many(questions)
+    QuestionQueue(session.session_id).delete()
+    session_locks.pop(session.session_id, None)
+
+
+async def send_next_question(session_id: str):
+    async with session_locks.setdefault(session_id, asyncio.Lock()):
+        session = await get_from_db(session_id, Session)
+        if (
+            not session
+            or session["paused"]
+            or session["currently_solving"] != "none"
+        ):
+            return
+
+        thread = bot.get_channel(int(session["thread_id"]))
+        if not thread:
+            return
+
+        queue = QuestionQueue(session_id)
+        if not queue.exists():
+            # Sessions started before questions were queued.
+            queue.create(
+                list(
+                    filter(
+                        lambda x: x["solved"] == 0,
+                        Question.find(Question.session_id == session_id).all(),
+                    )
+                )
+            )
+        question_name, question_number, total = queue.peek()
+
+        if not question_name:
+            await close_session(
+                session, "No more questions left! Ending the session..."
+            )
+            return
+
+        question = Question.get(question_name)
+
+        session["currently_solving"] = question.question_name
+        state.set_field(session_id, "currently_solving", question.question_name)
+
+        embeds = []
+        for qs in question["questions"]:
+            embed = discord.Embed()
+            if len(embeds) == 0:
+                embed.title = f"{question['question_name']}".replace(
+                    f"_{session['session_id']}", ""
+                )
+                embed.set_footer(text=f"Question {question_number}/{total}")
+            embed.set_image(
+                url=f"https://pub-8153dcb2290449f2924ed014b10896ee.r2.dev/{qs}"
+            )
+            embeds.append(embed)
+
+        await thread.send(
+            embeds=embeds, view=MCQButtonsView(question["question_name"])
+        )
+
+
+@bot.event
+async def on_practice_question_solved(session_id: str):
+    # Dispatched by MCQButton once every participant has answered.
+    await send_next_question(session_id)
+
+
+async def dispatch_idle_sessions():
+    sessions = Session.find(
+        (Session.paused == 0) & (Session.currently_solving == "none")
+    ).all()
+    for session in sessions:
+        await send_next_question(session.session_id)
 
 
 async def new_session(interaction: discord.Interaction):
@@ -129,6 +214,7 @@ async def new_session(interaction: discord.Interaction):
 
     session_data = TempSessionData(user_id=str(interaction.user.id))
     session_data.save()
+    session_data.expire(TEMP_SESSION_TTL)
 
     modal = GetUserInput()
     await interaction.response.send_modal(modal=modal)
@@ -175,7 +261,7 @@ async def new_session(interaction: discord.Interaction):
 
     tempdata = TempSessionData.get(interaction.user.id)
 
-    questions = questionsdb.get_questions(
+    questions = await questionsdb.get_questions(
         subject_code=tempdata["subject"],
         minimum_year=int(tempdata["minimum_year"]),
         limit=int(tempdata["limit"]),
@@ -264,6 +350,8 @@ async def new_session(interaction: discord.Interaction):
         f"{interaction.user.mention} has started a new practice session!\n\nUsers: {', '.join(mentioned_users)}\nSession ID: {session.session_id}"
     )
     session.save()
+    expire_session_keys(session)
+    await send_next_question(session.session_id)
 
 
 async def leave_session(interaction: discord.Interaction):
@@ -284,8 +372,7 @@ async def leave_session(interaction: discord.Interaction):
         return
 
     session["users"].remove(str(interaction.user.id))
-
-    session.save()
+    state.remove_user(session.session_id, str(interaction.user.id))
 
     thread = interaction.guild.get_thread(int(session["thread_id"]))
     await thread.remove_user(interaction.user)
@@ -365,8 +452,8 @@ async def pause_session(interaction: discord.Interaction):
         )
         return
 
-    session["paused"] = True
-    session.save()
+    session["paused"] = 1
+    state.set_field(session.session_id, "paused", 1)
 
     thread = interaction.guild.get_thread(int(session["thread_id"]))
     await thread.send(f"{interaction.user.mention} has paused this session!")
@@ -397,14 +484,15 @@ async def resume_session(interaction: discord.Interaction):
         )
         return
 
-    session["paused"] = False
-    session.save()
+    session["paused"] = 0
+    state.set_field(session.session_id, "paused", 0)
 
     thread = interaction.guild.get_thread(int(session["thread_id"]))
     await thread.send(f"{interaction.user.mention} has resumed this session!")
     await thread.edit(locked=False)
 
     await interaction.response.send_message("Resumed the session!", ephemeral=True)
+    await send_next_question(session.session_id)
 
 
 async def add_to_session(interaction: discord.Interaction):
@@ -464,7 +552,8 @@ async def add_to_session(interaction: discord.Interaction):
     user_db.save()
 
     session["users"].append(str(user.id))
-    session.save()
+    state.add_user(session.session_id, str(user.id))
+    expire_session_keys(session)
 
     await interaction.edit(f"Added {user.mention} to the session!", view=None)
 
@@ -514,7 +603,7 @@ async def remove_from_session(interaction: discord.Interaction):
     await thread.remove_user(user)
 
     session["users"].remove(str(user.id))
-    session.save()
+    state.remove_user(session.session_id, str(user.id))
 
     await interaction.edit(f"Removed {user.mention} from the session!", view=None)
 
@@ -627,7 +716,8 @@ async def join_session(interaction: discord.Interaction):
     user.save()
 
     session["users"].append(str(interaction.user.id))
-    session.save()
+    state.add_user(session.session_id, str(interaction.user.id))
+    expire_session_keys(session)
 
     await interaction.edit(f"Joined the session, {thread.mention}!", view=None)
 
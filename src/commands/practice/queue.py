@@ -0,0 +1,68 @@
+from schemas.redis import Question
+from utils.constants import TEMP_SESSION_TTL
+
+# Returns the question name under the cursor, the cursor and the queue length
+# in one round trip.
+PEEK = """
+local cursor = tonumber(redis.call("GET", KEYS[2]) or "0")
+return {redis.call("LINDEX", KEYS[1], cursor), cursor, redis.call("LLEN", KEYS[1])}
+"""
+
+
+class QuestionQueue:
+    """The ordered questions of a practice session, stored as a Redis list.
+
+    The list holds question names in the order they are asked and a separate
+    counter points at the current one, so the next question, the number left
+    and the "Question n/total" footer all come from a single script call.
+    """
+
+    peek_script = None
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.key = f"practice:queue:{session_id}"
+        self.cursor_key = f"practice:queue:{session_id}:cursor"
+
+    @staticmethod
+    def db():
+        return Question.db()
+
+    def create(self, questions: list[Question]):
+        # Everything here expires like temporary session data until
+        # expire_session_keys lines it up with the session, so a session that
+        # never gets created doesn't leave its questions behind.
+        pipeline = self.db().pipeline(transaction=False)
+        for question in questions:
+            question.save(pipeline=pipeline)
+            pipeline.expire(
+                Question.make_primary_key(question.question_name), TEMP_SESSION_TTL
+            )
+        pipeline.delete(self.key)
+        if questions:
+            pipeline.rpush(
+                self.key, *(question.question_name for question in questions)
+            )
+            pipeline.expire(self.key, TEMP_SESSION_TTL)
+        pipeline.set(self.cursor_key, 0, ex=TEMP_SESSION_TTL)
+        pipeline.execute()
+
+    def peek(self) -> tuple[str | None, int, int]:
+        """Returns (current question name or None, its 1-based number, total)."""
+        if QuestionQueue.peek_script is None:
+            QuestionQueue.peek_script = self.db().register_script(PEEK)
+        name, cursor, total = QuestionQueue.peek_script(
+            keys=[self.key, self.cursor_key]
+        )
+        if isinstance(name, bytes):
+            name = name.decode()
+        return name, cursor + 1, total
+
+    def exists(self) -> bool:
+        return bool(self.db().exists(self.key))
+
+    def advance(self):
+        self.db().incr(self.cursor_key)
+
+    def delete(self):
+        self.db().delete(self.key, self.cursor_key)
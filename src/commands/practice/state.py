@@ -0,0 +1,55 @@
+from schemas.redis import Session
+import json
+
+# Sets one field of a session if the session still exists.
+# KEYS: session. ARGV: JSON path, JSON encoded value.
+SET_FIELD = """
+if redis.call("EXISTS", KEYS[1]) == 0 then
+    return 0
+end
+redis.call("JSON.SET", KEYS[1], ARGV[1], ARGV[2])
+return 1
+"""
+
+# Adds a user to or removes one from $.users, leaving the rest of the session
+# alone. Returns 1 if the list changed, 0 if not, -1 if there is no session.
+# KEYS: session. ARGV: "add" or "remove", user id.
+UPDATE_USERS = """
+if redis.call("EXISTS", KEYS[1]) == 0 then
+    return -1
+end
+local user = cjson.encode(ARGV[2])
+local index = redis.call("JSON.ARRINDEX", KEYS[1], "$.users", user)[1]
+if ARGV[1] == "add" and index == -1 then
+    redis.call("JSON.ARRAPPEND", KEYS[1], "$.users", user)
+    return 1
+end
+if ARGV[1] == "remove" and index ~= -1 then
+    redis.call("JSON.ARRPOP", KEYS[1], "$.users", index)
+    return 1
+end
+return 0
+"""
+
+# Once a session exists its fields are written one at a time instead of by
+# saving the whole document, which could undo a RECORD_ANSWER that ran since
+# the session was read.
+scripts = {}
+
+
+def run_script(source: str, session_id: str, *args) -> int:
+    if source not in scripts:
+        scripts[source] = Session.db().register_script(source)
+    return scripts[source](keys=[Session.make_primary_key(session_id)], args=list(args))
+
+
+def set_field(session_id: str, field: str, value) -> bool:
+    return bool(run_script(SET_FIELD, session_id, f"$.{field}", json.dumps(value)))
+
+
+def add_user(session_id: str, user_id: str) -> bool:
+    return run_script(UPDATE_USERS, session_id, "add", user_id) == 1
+
+
+def remove_user(session_id: str, user_id: str) -> bool:
+    return run_script(UPDATE_USERS, session_id, "remove", user_id) == 1
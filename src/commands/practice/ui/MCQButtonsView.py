@@ -6,9 +6,9 @@ options = ["A", "B", "C", "D"]
 
 class MCQButtonsView(discord.ui.View):
     def __init__(self, question_name: str):
-        super().__init__(timeout=None)
+        # Not stored per message: answers are dispatched by custom ID instead.
+        super().__init__(timeout=None, prevent_update=False)
 
         for option in options:
-            # This is a persistent view, custom IDs are required.
             button = MCQButton(label=option, custom_id=f"{question_name}_{option}")
             self.add_item(button)
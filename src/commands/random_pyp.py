@@ -1,4 +1,6 @@
-from bot import bot, commands, discord, random, pyshorteners
+from typing import NamedTuple
+from bot import bot, discord, random
+from utils.mongodb import linksdb
 from utils.data import (
     CIE_IGCSE_SUBJECT_CODES,
     CIE_OLEVEL_SUBJECT_CODES,
@@ -8,6 +10,110 @@ from utils.data import (
     cieolsubjectsdata,
 )
 
+BASE_URL = "https://edupapers.store/wp-content/uploads/simple-file-list/CIE"
+YEARS = ["2018", "2019", "2020", "2021", "2022", "2023"]
+PAPER_NUMBERS = "123456"
+SESSION_NAMES = {"s": "June", "w": "November", "m": "March"}
+
+# programme -> (subject codes, subject names, sessions papers are drawn from)
+PROGRAMMES = {
+    "IGCSE": (CIE_IGCSE_SUBJECT_CODES, cieigsubjectsdata, "swm"),
+    "O-Level": (CIE_OLEVEL_SUBJECT_CODES, cieolsubjectsdata, "sw"),
+    "A-Level": (CIE_ALEVEL_SUBJECT_CODES, ciealsubjectsdata, "swm"),
+}
+
+# Subjects whose papers come with an insert.
+INSERT_CODES = {
+    "0410",
+    "0445",
+    "0448",
+    "0449",
+    "0450",
+    "0454",
+    "0457",
+    "0460",
+    "0471",
+    "0500",
+    "0501",
+    "0502",
+    "0503",
+    "0504",
+    "0505",
+    "0508",
+    "0509",
+    "0513",
+    "0514",
+    "0516",
+    "0518",
+    "0538",
+    "9609",
+}
+
+# A document is (link label, file kind, paper code, extension), where the
+# paper code is formatted with the paper number and variant.
+QUESTION_PAPER = ("QP", "qp", "{paper}{variant}", "pdf")
+MARK_SCHEME = ("MS", "ms", "{paper}{variant}", "pdf")
+INSERT = ("INSERT", "in", "{paper}{variant}", "pdf")
+SOURCE_FILES = ("SF", "sf", "{paper}{variant}", "zip")
+DOCUMENT_NAMES = {
+    "qp": "question paper",
+    "ms": "marking scheme",
+    "in": "the insert",
+    "sf": "Source Files",
+}
+
+
+class Layout(NamedTuple):
+    sessions: str
+    # session -> variants to pick from
+    variants: dict[str, str]
+    # session -> documents to link
+    documents: dict[str, list[tuple[str, str, str, str]]]
+
+
+VARIANTS = {"s": "123", "w": "123", "m": "2"}
+
+# ICT practicals ship source files. Winter papers are numbered "0<paper>"
+# without a variant and only their mark scheme drops the leading zero.
+ICT_PRACTICAL = Layout(
+    "swm",
+    {"s": "12", "w": "1", "m": "1"},
+    {
+        "s": [QUESTION_PAPER, MARK_SCHEME, SOURCE_FILES],
+        "w": [
+            ("QP", "qp", "0{paper}", "pdf"),
+            ("MS", "ms", "{paper}", "pdf"),
+            ("SF", "sf", "0{paper}", "zip"),
+        ],
+        "m": [QUESTION_PAPER, MARK_SCHEME, SOURCE_FILES],
+    },
+)
+
+# Papers laid out differently from the rest, by (programme, subject, paper);
+# a paper of None covers every paper of the subject.
+SPECIAL_LAYOUTS = {
+    ("IGCSE", "0417", "2"): ICT_PRACTICAL,
+    ("IGCSE", "0417", "3"): ICT_PRACTICAL,
+    # Mandarin as a foreign language is only sat in June.
+    ("IGCSE", "0547", None): Layout(
+        "s", VARIANTS, {"s": [QUESTION_PAPER, MARK_SCHEME]}
+    ),
+}
+
+
+def get_layout(programme: str, subject_code: str, paper_number: str) -> Layout:
+    layout = SPECIAL_LAYOUTS.get(
+        (programme, subject_code, paper_number)
+    ) or SPECIAL_LAYOUTS.get((programme, subject_code, None))
+    if layout:
+        return layout
+
+    sessions = PROGRAMMES[programme][2]
+    documents = [QUESTION_PAPER, MARK_SCHEME]
+    if subject_code in INSERT_CODES:
+        documents.append(INSERT)
+    return Layout(sessions, VARIANTS, dict.fromkeys(sessions, documents))
+
 
 @bot.slash_command(name="random_pyp", description="Gets a random CAIE past year paper.")
 async def random_pyp(
@@ -25,355 +131,50 @@ async def random_pyp(
         name="paper_no", description="Enter a paper number", required=True
     ),
 ):
+    if len(paper_number) != 1 or paper_number not in PAPER_NUMBERS:
+        await interaction.send(
+            "Invalid Paper Number. Please try again.", ephemeral=True
+        )
+        return
 
-    # PAPER_INFORMATION
-    INSERT_CODES = [
-        "0410",
-        "0445",
-        "0448",
-        "0449",
-        "0450",
-        "0454",
-        "0457",
-        "0460",
-        "0471",
-        "0500",
-        "0501",
-        "0502",
-        "0503",
-        "0504",
-        "0505",
-        "0508",
-        "0509",
-        "0513",
-        "0514",
-        "0516",
-        "0518",
-        "0538",
-        "9609",
-    ]
-    YEARS = ["2018", "2019", "2020", "2021", "2022", "2023"]
-    PAPER_VARIANT = ["1", "2", "3"]
-    SESSIONS = ["s", "w", "m"]
-    if programme == "O-Level":
-        SESSIONS = ["s", "w"]
-
-    PAPER_VARIANT_TWO = ["1", "2"]
-    channel = interaction.channel
-
-    # USAGE OF THE RANDOM VARIABLE
-    ranyear = random.choice(YEARS)
-    ranvar = random.choice(PAPER_VARIANT)
-    ranses = random.choice(SESSIONS)
+    subject_codes, subject_names, _ = PROGRAMMES[programme]
+    if subject_code not in subject_codes:
+        await interaction.send(
+            "Invalid Subject Code. Please try again.", ephemeral=True
+        )
+        return
 
-    # EMPTY_VARIABLES
-    sesh = ""
+    ephemeral = interaction.channel.type != discord.ChannelType.voice
+    await interaction.response.defer(ephemeral=ephemeral)
 
-    in_validation = INSERT_CODES.__contains__(subject_code)
-    pn_validation = len(paper_number)
-    ig_validation = CIE_IGCSE_SUBJECT_CODES.__contains__(subject_code)
-    al_validation = CIE_ALEVEL_SUBJECT_CODES.__contains__(subject_code)
-    ol_validation = CIE_OLEVEL_SUBJECT_CODES.__contains__(subject_code)
+    layout = get_layout(programme, subject_code, paper_number)
+    session = random.choice(layout.sessions)
+    year = random.choice(YEARS)
+    variant = random.choice(layout.variants[session])
+    documents = layout.documents[session]
 
-    if programme == "IGCSE":
-        if pn_validation == 1:
-            if paper_number <= "6" and paper_number != "0":
-                if ig_validation:
-                    subject_name = cieigsubjectsdata.get(subject_code)
-                    if subject_code == "0417" and paper_number in ["2", "3"]:
-                        if ranses == "w" and ranyear != ["2019"]:
-                            sesh = "November"
-                            qpv = f"0{paper_number}"
-                            msv = f"{paper_number}"
-                            qpcode = f"{subject_code}_{ranses}{ranyear[2:5]}_qp_{qpv}"
-                            qpurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{qpv}.pdf"
-                            )
-                            msurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_ms_{msv}.pdf"
-                            )
-                            sfurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_sf_{qpv}.zip"
-                            )
-                            embed = discord.Embed(
-                                title="Random Paper Chosen",
-                                description=f"`{qpcode}` has been chosen at random. Below are links to the question paper, marking scheme and Source Files.\n\n**QP LINK**: {qpurl}\n**MS LINK**: {msurl}\n**SF LINK**: {sfurl}",
-                                color=0xF4B6C2,
-                            )
-                            if channel.type == discord.ChannelType.voice:
-                                await interaction.send(embed=embed, ephemeral=False)
-                            else:
-                                await interaction.send(embed=embed, ephemeral=True)
-                        elif ranses == "w" and ranyear == "2019":
-                            sesh = "November"
-                            qpv = f"{paper_number}"
-                            msv = f"{paper_number}"
-                            qpcode = f"{subject_code}_{ranses}{ranyear[2:5]}_qp_{qpv}"
-                            qpurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{qpv}.pdf"
-                            )
-                            msurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_ms_{msv}.pdf"
-                            )
-                            sfurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_sf_{qpv}.zip"
-                            )
-                            embed = discord.Embed(
-                                title="Random Paper Chosen",
-                                description=f"`{qpcode}` has been chosen at random. Below are links to the question paper, marking scheme and Source Files.\n\n**QP LINK**: {qpurl}\n**MS LINK**: {msurl}\n**SF LINK**: {sfurl}",
-                                color=0xF4B6C2,
-                            )
-                            if channel.type == discord.ChannelType.voice:
-                                await interaction.send(embed=embed, ephemeral=False)
-                            else:
-                                await interaction.send(embed=embed, ephemeral=True)
-                        else:
-                            if ranses == "s":
-                                sesh = "June"
-                                ranvar = random.choice(PAPER_VARIANT_TWO)
-                            else:
-                                sesh = "March"
-                                ranvar = "1"
-                            qpcode = f"{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}"
-                            qpurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}.pdf"
-                            )
-                            msurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_ms_{paper_number}{ranvar}.pdf"
-                            )
-                            sfurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_sf_{paper_number}{ranvar}.zip"
-                            )
-                            embed = discord.Embed(
-                                title="Random Paper Chosen",
-                                description=f"`{qpcode}` has been chosen at random. Below are links to the question paper, marking scheme and Source Files.\n\n**QP LINK**: {qpurl}\n**MS LINK**: {msurl}\n**SF LINK**: {sfurl}",
-                                color=0xF4B6C2,
-                            )
-                            if channel.type == discord.ChannelType.voice:
-                                await interaction.send(embed=embed, ephemeral=False)
-                            else:
-                                await interaction.send(embed=embed, ephemeral=True)
-                    elif subject_code == "0547":
-                        sesh == "s"
-                        sesh = "June"
-                        qpcode = f"{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}"
-                        qpurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{sesh}{ranyear[2:5]}_qp_{paper_number}{ranvar}.pdf"
-                        )
-                        msurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_ms_{paper_number}{ranvar}.pdf"
-                        )
-                        embed = discord.Embed(
-                            title="Random Paper Chosen",
-                            description=f"`{qpcode}` has been chosen at random. Below are links to the question paper, marking scheme and the insert.\n\n**QP LINK**: {qpurl}\n**MS LINK**: {msurl}",
-                            color=0xF4B6C2,
-                        )
-                        if channel.type == discord.ChannelType.voice:
-                            await interaction.send(embed=embed, ephemeral=False)
-                        else:
-                            await interaction.send(embed=embed, ephemeral=True)
-                    else:
-                        if in_validation:
-                            if ranses == "s":
-                                sesh = "June"
-                            elif ranses == "w":
-                                sesh = "November"
-                            else:
-                                sesh = "March"
-                                ranvar = "2"
-                            qpcode = f"{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}"
-                            # url = f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}.pdf"
-                            qpurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}.pdf"
-                            )
-                            msurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_ms_{paper_number}{ranvar}.pdf"
-                            )
-                            inurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_in_{paper_number}{ranvar}.pdf"
-                            )
-                            embed = discord.Embed(
-                                title="Random Paper Chosen",
-                                description=f"`{qpcode}` has been chosen at random. Below are links to the question paper, marking scheme and the insert.\n\n**QP LINK**: {qpurl}\n**MS LINK**: {msurl}\n**INSERT LINK**: {inurl}",
-                                color=0xF4B6C2,
-                            )
-                            if channel.type == discord.ChannelType.voice:
-                                await interaction.send(embed=embed, ephemeral=False)
-                            else:
-                                await interaction.send(embed=embed, ephemeral=True)
-                        else:
-                            if ranses == "s":
-                                sesh = "June"
-                            elif ranses == "w":
-                                sesh = "November"
-                            else:
-                                sesh = "March"
-                                ranvar = "2"
-                            qpcode = f"{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}"
-                            qpurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}.pdf"
-                            )
-                            msurl = pyshorteners.Shortener().tinyurl.short(
-                                f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_ms_{paper_number}{ranvar}.pdf"
-                            )
-                            embed = discord.Embed(
-                                title="Random Paper Chosen",
-                                description=f"`{qpcode}` has been chosen at random. Below are links to the question paper and marking scheme.\n\n**QP LINK**: {qpurl}\n**MS LINK**: {msurl}",
-                                color=0xF4B6C2,
-                            )
-                            if channel.type == discord.ChannelType.voice:
-                                await interaction.send(embed=embed, ephemeral=False)
-                            else:
-                                await interaction.send(embed=embed, ephemeral=True)
-                else:
-                    await interaction.send(
-                        "Invalid Subject Code. Please try again.", ephemeral=True
-                    )
-            else:
-                await interaction.send(
-                    "Invalid Paper Number. Please try again.", ephemeral=True
-                )
-        else:
-            await interaction.send(
-                "Invalid Paper Number. Please try again.", ephemeral=True
-            )
-
-    elif programme == "O-Level":
-        if pn_validation == 1:
-            if paper_number <= "6" and paper_number != "0":
-                if ol_validation:
-                    subject_name = cieolsubjectsdata.get(subject_code)
-                    if in_validation:
-                        if ranses == "s":
-                            sesh = "June"
-                        elif ranses == "w":
-                            sesh = "November"
-                        else:
-                            sesh = "March"
-                            ranvar = "2"
-                        qpcode = f"{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}"
-                        # url = f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}.pdf"
-                        qpurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}.pdf"
-                        )
-                        msurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_ms_{paper_number}{ranvar}.pdf"
-                        )
-                        inurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_in_{paper_number}{ranvar}.pdf"
-                        )
-                        embed = discord.Embed(
-                            title="Random Paper Chosen",
-                            description=f"`{qpcode}` has been chosen at random. Below are links to the question paper, marking scheme and the insert.\n\n**QP LINK**: {qpurl}\n**MS LINK**: {msurl}\n**INSERT LINK**: {inurl}",
-                            color=0xF4B6C2,
-                        )
-                        if channel.type == discord.ChannelType.voice:
-                            await interaction.send(embed=embed, ephemeral=False)
-                        else:
-                            await interaction.send(embed=embed, ephemeral=True)
-                    else:
-                        if ranses == "s":
-                            sesh = "June"
-                        elif ranses == "w":
-                            sesh = "November"
-                        else:
-                            sesh = "March"
-                            ranvar = "2"
-                        qpcode = f"{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}"
-                        qpurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}.pdf"
-                        )
-                        msurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_ms_{paper_number}{ranvar}.pdf"
-                        )
-                        embed = discord.Embed(
-                            title="Random Paper Chosen",
-                            description=f"`{qpcode}` has been chosen at random. Below are links to the question paper and marking scheme.\n\n**QP LINK**: {qpurl}\n**MS LINK**: {msurl}",
-                            color=0xF4B6C2,
-                        )
-                        if channel.type == discord.ChannelType.voice:
-                            await interaction.send(embed=embed, ephemeral=False)
-                        else:
-                            await interaction.send(embed=embed, ephemeral=True)
-                else:
-                    await interaction.send(
-                        "Invalid Subject Code. Please try again.", ephemeral=True
-                    )
-            else:
-                await interaction.send(
-                    "Invalid Paper Number. Please try again.", ephemeral=True
-                )
-        else:
-            await interaction.send(
-                "Invalid Paper Number. Please try again.", ephemeral=True
-            )
+    folder = f"{BASE_URL}/{programme}/{subject_names.get(subject_code)}-{subject_code}/{year}/{SESSION_NAMES[session]}"
+    files = [
+        f"{subject_code}_{session}{year[2:]}_{kind}_{code.format(paper=paper_number, variant=variant)}"
+        for _, kind, code, _ in documents
+    ]
+    # Shortened concurrently on a miss, straight from the cache otherwise.
+    links = await linksdb.shorten(
+        [
+            f"{folder}/{file}.{extension}"
+            for file, (_, _, _, extension) in zip(files, documents)
+        ]
+    )
 
-    elif programme == "A-Level":
-        if pn_validation == 1:
-            if paper_number <= "6" and paper_number != "0":
-                if al_validation:
-                    subject_name = ciealsubjectsdata.get(subject_code)
-                    if in_validation:
-                        if ranses == "s":
-                            sesh = "June"
-                        elif ranses == "w":
-                            sesh = "November"
-                        else:
-                            sesh = "March"
-                            ranvar = "2"
-                        qpcode = f"{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}"
-                        # url = f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}.pdf"
-                        qpurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}.pdf"
-                        )
-                        msurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_ms_{paper_number}{ranvar}.pdf"
-                        )
-                        inurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_in_{paper_number}{ranvar}.pdf"
-                        )
-                        embed = discord.Embed(
-                            title="Random Paper Chosen",
-                            description=f"`{qpcode}` has been chosen at random. Below are links to the question paper, marking scheme and the insert.\n\n**QP LINK**: {qpurl}\n**MS LINK**: {msurl}\n**INSERT LINK**: {inurl}",
-                            color=0xF4B6C2,
-                        )
-                        if channel.type == discord.ChannelType.voice:
-                            await interaction.send(embed=embed, ephemeral=False)
-                        else:
-                            await interaction.send(embed=embed, ephemeral=True)
-                    else:
-                        if ranses == "s":
-                            sesh = "June"
-                        elif ranses == "w":
-                            sesh = "November"
-                        else:
-                            sesh = "March"
-                            ranvar = "2"
-                        qpcode = f"{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}"
-                        qpurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_qp_{paper_number}{ranvar}.pdf"
-                        )
-                        msurl = pyshorteners.Shortener().tinyurl.short(
-                            f"https://edupapers.store/wp-content/uploads/simple-file-list/CIE/{programme}/{subject_name}-{subject_code}/{ranyear}/{sesh}/{subject_code}_{ranses}{ranyear[2:5]}_ms_{paper_number}{ranvar}.pdf"
-                        )
-                        embed = discord.Embed(
-                            title="Random Paper Chosen",
-                            description=f"`{qpcode}` has been chosen at random. Below are links to the question paper and marking scheme.\n\n**QP LINK**: {qpurl}\n**MS LINK**: {msurl}",
-                            color=0xF4B6C2,
-                        )
-                        if channel.type == discord.ChannelType.voice:
-                            await interaction.send(embed=embed, ephemeral=False)
-                        else:
-                            await interaction.send(embed=embed, ephemeral=True)
-                else:
-                    await interaction.send(
-                        "Invalid Subject Code. Please try again.", ephemeral=True
-                    )
-            else:
-                await interaction.send(
-                    "Invalid Paper Number. Please try again.", ephemeral=True
-                )
-        else:
-            await interaction.send(
-                "Invalid Paper Number. Please try again.", ephemeral=True
-            )
+    names = [DOCUMENT_NAMES[kind] for _, kind, _, _ in documents]
+    listed = f"{', '.join(names[:-1])} and {names[-1]}"
+    link_lines = "\n".join(
+        f"**{label} LINK**: {link}"
+        for (label, _, _, _), link in zip(documents, links)
+    )
+    embed = discord.Embed(
+        title="Random Paper Chosen",
+        description=f"`{files[0]}` has been chosen at random. Below are links to the {listed}.\n\n{link_lines}",
+        color=0xF4B6C2,
+    )
+    await interaction.send(embed=embed, ephemeral=ephemeral)
@@ -14,7 +14,7 @@ async def rep(
     await interaction.response.defer()
     if user is None:
         user = interaction.user
-    rep = repdb.get_rep(user.id, interaction.guild.id)
+    rep = await repdb.get_rep(user.id, interaction.guild.id)
     if rep is None:
         rep = 0
     await interaction.send(f"{user} has {rep} rep.", ephemeral=False)
@@ -38,12 +38,13 @@ async def change_rep(
 ):
     if await is_moderator(interaction.user):
         await interaction.response.defer()
-        mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", interaction.guild.id)) 
+        mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", interaction.guild.id)) 
         timern = int(time.time()) + 1
         user_id = int(user.id)
         new_rep = int(new_rep)
         guild_id = int(interaction.guild.id)
-        rep = repdb.change_rep(user_id, new_rep, guild_id)    
+        rep = await repdb.change_rep(user_id, new_rep, guild_id)
+        bot.dispatch("rep_change", interaction.guild, user_id, rep)
         if mod_log_channel:
             embed = discord.Embed(
                 description="Rep Changed", colour=discord.Colour.blurple()
@@ -83,7 +84,7 @@ async def leaderboard(
     ),
 ):
     await interaction.response.defer()
-    leaderboard = repdb.rep_leaderboard(interaction.guild.id)
+    leaderboard = await repdb.rep_leaderboard(interaction.guild.id)
     leaderboard = [item.values() for item in leaderboard]
     chunks = [list(leaderboard)[x : x + 9] for x in range(0, len(leaderboard), 9)]
     pages = []
@@ -99,7 +100,8 @@ async def leaderboard(
                     page = n + 1
             user_name = interaction.guild.get_member(user)
             if rep == 0 or user_name is None:
-                repdb.delete_user(user, interaction.guild.id)
+                await repdb.delete_user(user, interaction.guild.id)
+                bot.dispatch("rep_change", interaction.guild, user, 0)
             else:
                 embed.add_field(name=user_name, value=str(rep) + "\n", inline=True)
         pages.append(embed)
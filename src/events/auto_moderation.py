@@ -23,27 +23,11 @@ async def on_auto_moderation_action_execution(automod_execution):
 
         human_readable_time = f"{timeout_time_seconds // SECONDS_PER_DAY}d {(timeout_time_seconds % SECONDS_PER_DAY) // SECONDS_PER_HOUR}h {(timeout_time_seconds % SECONDS_PER_HOUR) // SECONDS_PER_MINUTE}m {timeout_time_seconds % SECONDS_PER_MINUTE}s"
         ban_message_channel = bot.get_channel(
-            gpdb.get_pref("behavior_log_channel", automod_execution.guild_id)
+            await gpdb.get_pref("behavior_log_channel", automod_execution.guild_id)
         )
 
+        case_no = await punishdb.next_case_id(automod_execution.guild_id)
         if ban_message_channel:
-            try:
-                last_ban_message = await ban_message_channel.history(limit=1).flatten()
-                case_no = (
-                    int(
-                        "".join(
-                            list(
-                                filter(
-                                    str.isdigit,
-                                    last_ban_message[0].content.splitlines()[0],
-                                )
-                            )
-                        )
-                    )
-                    + 1
-                )
-            except Exception:
-                case_no = 1
             timeout_message = f"""Case #{case_no} | [{action_type}]\nUsername: {member.name} ({member.id})\nModerator: Automod\nReason: {reason}\nDuration: {human_readable_time}\nUntil: <t:{int(time.time()) + timeout_time_seconds}> (<t:{int(time.time()) + timeout_time_seconds}:R>)"""  # PEP-8 line len limit crying, but it's better than before
 
             await ban_message_channel.send(timeout_message)
@@ -62,7 +46,7 @@ async def on_auto_moderation_action_execution(automod_execution):
             if timeout_time_seconds >= (3600 * 24 * 7):
                 points = 4
 
-            punishdb.add_punishment(
+            await punishdb.add_punishment(
                 case_no,
                 member.id,
                 "Automod",
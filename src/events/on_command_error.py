@@ -9,6 +9,6 @@ async def on_command_error(ctx, exception):  # Deprecate soon??
         return
     description = f"Channel: {ctx.channel.mention}\nUser: {ctx.author.mention}\nGuild: {ctx.guild.name} ({ctx.guild.id})\n\nError:\n```{''.join(traceback.format_exception(exception, exception, exception.__traceback__))}```"
     embed = discord.Embed(title="An Exception Occured", description=description)
-    botlogs = bot.get_channel(gpdb.get_pref("botlogs_channel", ctx.guild.id))
+    botlogs = bot.get_channel(await gpdb.get_pref("botlogs_channel", ctx.guild.id))
     if botlogs:
         await botlogs.send(embed=embed)
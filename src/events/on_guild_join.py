@@ -15,4 +15,4 @@ import global_vars
 async def on_guild_join(guild):
     chnl_name = 'bot-news'
     new_channel = await guild.create_text_channel(chnl_name)
-    gpdb.set_pref("botnews_channel", new_channel.id, guild.id)
\ No newline at end of file
+    await gpdb.set_pref("botnews_channel", new_channel.id, guild.id)
\ No newline at end of file
@@ -7,11 +7,12 @@ from utils.data import REP_DISABLE_CHANNELS
 from bot import discord, bot, keywords, datetime, time, pymongo
 import sys
 from commands.dms import send_dm
-from utils.mongodb import gpdb, smdb, repdb, kwdb
+from utils.mongodb import gpdb, smdb, repdb, kwdb, get_db
 from utils.roles import is_moderator, is_helper, is_chat_moderator
 import global_vars
+from utils.matcher import classify, MessageMatch
+from utils.broadcast import broadcast_news
 
-sticky_counter = {}
 user_message_counts = {}
 allowed_user_ids = {604335693757677588, 838682557976936509, 611165590744203285}
 
@@ -22,9 +23,9 @@ async def get_thread(message: discord.Message, is_dm: bool, guild_id):
 
       guild = bot.get_guild(guild_id)
       member = guild.get_member(member_id)
-      channel = guild.get_channel(gpdb.get_pref("dm_threads_channel", guild_id))
+      channel = guild.get_channel(await gpdb.get_pref("dm_threads_channel", guild_id))
       if channel is not None:
-        newmsg_channel = guild.get_channel(gpdb.get_pref("modmail_logs_channel", guild_id)) 
+        newmsg_channel = guild.get_channel(await gpdb.get_pref("modmail_logs_channel", guild_id)) 
         threads = channel.threads
         thread_name = f"{member_id}"
         thread = discord.utils.get(threads, name=thread_name)
@@ -76,47 +77,7 @@ async def counting(message: discord.Message):
         await message.delete()
 
 
-async def is_welcome(text: str):
-    alternatives = ["you're welcome", "your welcome", "ur welcome", "no problem"]
-    alternatives_2 = ["np", "np!", "yw", "yw!"]
-    lowercase = text.lower()
-    if "welcome" == lowercase:
-        return True
-    else:
-        for alternative in alternatives:
-            if alternative in lowercase:
-                return True
-        for alternative in alternatives_2:
-            if alternative in lowercase.split() or alternative == lowercase:
-                return True
-    return False
-
-
-async def is_thanks(text: str):
-    alternatives = [
-        "thanks",
-        "thank",
-        "thank you",
-        "thx",
-        "tysm",
-        "thank u",
-        "thnks",
-        "tanks",
-        "thanku",
-        "tyvm",
-        "thankyou",
-        "ty!",
-    ]
-    lowercase = text.lower()
-    if "ty" in lowercase.split():
-        return True
-    else:
-        for alternative in alternatives:
-            if alternative in lowercase:
-                return True
-
-
-async def handle_rep(message: discord.Message):
+async def handle_rep(message: discord.Message, match: MessageMatch):
     repped = []
     if message.reference:
         msg = await message.channel.fetch_message(message.reference.message_id)
@@ -126,10 +87,10 @@ async def handle_rep(message: discord.Message):
         and msg.author != message.author
         and not msg.author.bot
         and not message.author.mentioned_in(msg)
-        and (await is_welcome(message.content))
+        and match.welcome
     ):
         repped = [message.author]
-    elif await is_thanks(message.content):
+    elif match.thanks:
         for mention in message.mentions:
             if mention == message.author:
                 await message.channel.send(
@@ -144,7 +105,8 @@ async def handle_rep(message: discord.Message):
 
     if repped and not BETA:
         for user in repped:
-            rep = repdb.add_rep(user.id, message.guild.id)
+            rep = await repdb.add_rep(user.id, message.guild.id)
+            bot.dispatch("rep_change", message.guild, user.id, rep)
             if rep == 100:
                 role = discord.utils.get(user.guild.roles, name=f"{rep}+ Rep Club")
                 await user.add_roles(role)
@@ -157,7 +119,7 @@ async def handle_rep(message: discord.Message):
                     color=0x8BF797,
                 )              
                 await send_dm(user, embed=hundredplusembed)
-                channel = bot.get_channel(gpdb.get_pref("dm_threads_channel", message.guild.id)) 
+                channel = bot.get_channel(await gpdb.get_pref("dm_threads_channel", message.guild.id)) 
                 threads = channel.threads
                 thread_name = f"{user.id}"
                 thread = discord.utils.get(threads, name=thread_name)
@@ -187,7 +149,7 @@ async def handle_rep(message: discord.Message):
                     color=0x8BF797,
                 )                
                 await send_dm(user, embed=thousandplusembed)
-                channel = bot.get_channel(gpdb.get_pref("dm_threads_channel", message.guild.id)) 
+                channel = bot.get_channel(await gpdb.get_pref("dm_threads_channel", message.guild.id)) 
                 threads = channel.threads
                 thread_name = f"{user.id}"
                 thread = discord.utils.get(threads, name=thread_name)
@@ -216,7 +178,7 @@ async def on_message(message: discord.Message):
             color=0x8BF797,
         )
         await send_dm(user, embed=serverboosterembed)
-        channel = bot.get_channel(gpdb.get_pref("dm_threads_channel", message.guild.id)) 
+        channel = bot.get_channel(await gpdb.get_pref("dm_threads_channel", message.guild.id)) 
         threads = channel.threads
         thread_name = f"{user.id}"
         thread = discord.utils.get(threads, name=thread_name)
@@ -230,31 +192,8 @@ async def on_message(message: discord.Message):
             await thread.send(embed=serverboosterembed)         
 
 
-    if any(
-        keyword in message.content.lower()
-        for keyword in [
-            "thanks",
-            "thank",
-            "thank you",
-            "thx",
-            "tysm",
-            "thank u",
-            "thnks",
-            "tanks",
-            "thanku",
-            "tyvm",
-            "thankyou",
-            "ty!",
-            "you're welcome",
-            "your welcome",
-            "ur welcome",
-            "no problem",
-            "np",
-            "np!",
-            "yw",
-            "yw!",
-        ]
-    ):
+    match = classify(message.content)
+    if match.rep_farm:
         user_id = message.author.id
         current_time = datetime.datetime.utcnow()
 
@@ -288,10 +227,10 @@ async def on_message(message: discord.Message):
             else:
                 user_message_counts[user_id] = {"count": 1, "timestamp": current_time}
 
-    if message.guild and bot.get_channel(gpdb.get_pref("create_dm_channel", message.guild.id)): 
-        if message.channel == bot.get_channel(gpdb.get_pref("create_dm_channel", message.guild.id)): await get_thread(message, False, message.guild.id)
+    if message.guild and bot.get_channel(await gpdb.get_pref("create_dm_channel", message.guild.id)): 
+        if message.channel == bot.get_channel(await gpdb.get_pref("create_dm_channel", message.guild.id)): await get_thread(message, False, message.guild.id)
 
-        if str(message.channel.type) in ["public_thread", "private_thread"] and message.channel.parent_id == gpdb.get_pref("dm_threads_channel", message.guild.id):
+        if str(message.channel.type) in ["public_thread", "private_thread"] and message.channel.parent_id == await gpdb.get_pref("dm_threads_channel", message.guild.id):
             member = message.guild.get_member(int(message.channel.name))
             if member == None:
                 embed = discord.Embed(title="Error Encountered", description="I don't have permission to send direct messages to that user as they either left the server or has been banned/kicked.", colour=discord.Colour.red())
@@ -328,19 +267,11 @@ async def on_message(message: discord.Message):
                 return
             suffix = "\n\n~ r/IGCSE Bot Developer Team"
             messagecontent = message.clean_content + suffix
-            guilds = bot.guilds
-            for guild in guilds:
-                bot_news = bot.get_channel(gpdb.get_pref("botnews_channel", guild.id))
-                if bot_news is not None:
-                    await bot_news.send(content=messagecontent)
-                else:
-                    new_channel = await guild.create_text_channel('bot-news')
-                    gpdb.set_pref("botnews_channel", new_channel.id, guild.id)
-                    time.sleep(1)
-                    bot_news = bot.get_channel(gpdb.get_pref("botnews_channel", guild.id))
-                    await bot_news.send(content=messagecontent)
-                break
-            await message.add_reaction("✅")
+            report = await broadcast_news(messagecontent)
+            await message.add_reaction(
+                "✅" if report.delivered == len(report.statuses) else "⚠️"
+            )
+            await message.reply(embed=report.embed(), file=report.file())
 
     if not message.guild:
         user = message.author
@@ -352,8 +283,7 @@ async def on_message(message: discord.Message):
         no_mutual_guilds = len(mutual_guilds)
         msg = None    
         if message.content == ".swap":
-            client = pymongo.MongoClient(LINK)
-            db = client.IGCSEBot
+            db = get_db()
             dmservers = db["dm_server_prefs"]
             pref = dmservers.delete_one({"user_id": user.id})  
             embed = discord.Embed(title="Select a server", description="Please select the server you want to send this message to. You can do so by reacting with the corresponding emote:\n\n", color=0xDDF19B)
@@ -380,8 +310,7 @@ async def on_message(message: discord.Message):
             return         
 
         if no_mutual_guilds != 1:
-            client = pymongo.MongoClient(LINK)
-            db = client.IGCSEBot
+            db = get_db()
             dmservers = db["dm_server_prefs"]
             pref = dmservers.find_one({"user_id": user.id})
 
@@ -459,8 +388,8 @@ async def on_message(message: discord.Message):
         # Threads have different IDs than parent channel
         channel_id_rep = message.channel.parent_id
     isrepchannel = channel_id_rep not in REP_DISABLE_CHANNELS
-    if gpdb.get_pref("rep_enabled", message.guild.id) and isrepchannel:
-        await handle_rep(message)
+    if await gpdb.get_pref("rep_enabled", message.guild.id) and isrepchannel:
+        await handle_rep(message, match)
     if message.channel.name == "counting":
         await counting(message)
 
@@ -468,12 +397,7 @@ async def on_message(message: discord.Message):
         message.guild.id == GUILD_ID
         and str(message.channel.id) in global_vars.sticky_channels
     ):
-        sticky_counter[message.channel.id] = (
-            sticky_counter.get(message.channel.id, 0) + 1
-        )
-        if sticky_counter[message.channel.id] >= 4:
-            sticky_counter[message.channel.id] = 0
-            await smdb.check_stick_msg(message)
+        smdb.notify(message.channel)
 
     if message.content.lower() == "pin":
         if (
@@ -530,9 +454,9 @@ async def on_message(message: discord.Message):
                     )
 
     if not keywords.get(message.guild.id, None):
-        keywords[message.guild.id] = kwdb.get_keywords(message.guild.id)
-    if message.content.lower() in keywords[message.guild.id].keys():
-        autoreply = keywords[message.guild.id][message.content.lower()]
+        keywords[message.guild.id] = await kwdb.get_keywords(message.guild.id)
+    autoreply = keywords[message.guild.id].get(match.text)
+    if autoreply:
         if not autoreply.startswith("http"):  # If autoreply is a link/image/media
             keyword_embed = discord.Embed(
                 description=autoreply, colour=discord.Colour.blue()
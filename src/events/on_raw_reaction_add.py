@@ -1,4 +1,5 @@
-from bot import discord, bot, requests
+from bot import discord, bot
+from utils.http import http
 from utils.constants import GUILD_ID
 from utils.mongodb import gpdb, rrdb
 from utils.roles import is_moderator
@@ -15,7 +16,7 @@ async def on_raw_reaction_add(reaction):
 
     guild = user.guild
 
-    is_rr = rrdb.get_rr(str(reaction.emoji), reaction.message_id)
+    is_rr = await rrdb.get_rr(str(reaction.emoji), reaction.message_id)
     if is_rr is not None:
         role = guild.get_role(is_rr["role"])
         await user.add_roles(role)
@@ -28,7 +29,7 @@ async def on_raw_reaction_add(reaction):
         return
 
     if (
-        message.channel.id == gpdb.get_pref("emote_channel", reaction.guild_id)
+        message.channel.id == await gpdb.get_pref("emote_channel", reaction.guild_id)
         and str(reaction.emoji) == "🔒"
     ):
         upvotes = 0
@@ -44,7 +45,7 @@ async def on_raw_reaction_add(reaction):
         ]
         if upvotes / downvotes >= 3:
             emoji = await message.guild.create_custom_emoji(
-                name=name, image=requests.get(message.attachments[0].url).content
+                name=name, image=(await http.get(message.attachments[0].url)).body
             )
             await message.reply(
                 f"The submission by {message.mentions[0]} for the emote {str(emoji)} has passed."
@@ -58,7 +59,7 @@ async def on_raw_reaction_add(reaction):
         str(reaction.emoji) == "🟢"
         and reaction.user_id != bot.user.id
         and message.channel.id
-        == gpdb.get_pref("suggestions_channel", reaction.guild_id)
+        == await gpdb.get_pref("suggestions_channel", reaction.guild_id)
     ):
         author = message.channel.guild.get_member(reaction.user_id)
         if await is_moderator(author):
@@ -91,7 +92,7 @@ async def on_raw_reaction_add(reaction):
         str(reaction.emoji) == "🔴"
         and reaction.user_id != bot.user.id
         and message.channel.id
-        == gpdb.get_pref("suggestions_channel", reaction.guild_id)
+        == await gpdb.get_pref("suggestions_channel", reaction.guild_id)
     ):
         author = message.channel.guild.get_member(reaction.user_id)
         if await is_moderator(author):
@@ -9,7 +9,7 @@ async def on_raw_reaction_remove(reaction):
     user = await guild.fetch_member(reaction.user_id)
     if user.bot:
         return
-    is_rr = rrdb.get_rr(str(reaction.emoji), reaction.message_id)
+    is_rr = await rrdb.get_rr(str(reaction.emoji), reaction.message_id)
     if is_rr is not None:
         role = guild.get_role(is_rr["role"])
         await user.remove_roles(role)
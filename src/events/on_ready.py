@@ -10,30 +10,35 @@ from utils.constants import (
     BOT_DEVELOPER_ROLE,
     TEMP_MODERATOR_ROLE,
     STAFF_MODERATOR_ROLE,
+    PROFILER_INTERVAL_MS,
+    LOOP_WATCHDOG_MS,
 )
 from monitor_tasks import (
-    checklock,
-    checkmute,
     handle_slowmode,
     autorefreshhelpers,
-    send_questions,
     expire_sessions,
     populate_cache,
     resetdmprefs,
+    refresh_question_pools,
+    sweep_practice_keys,
+    send_infraction_report,
+    update_leaderboard,
 )
-from schemas.redis import View
-from commands.practice.ui import MCQButtonsView
-from utils.mongodb import smdb, gpdb
+from commands.practice import dispatch_idle_sessions
+from utils.mongodb import smdb, gpdb, punishdb, ensure_indexes
+from utils.scheduler import scheduler
+from utils.metrics import profiler, watchdog
 
 loops = [
-    checklock,
-    checkmute,
     autorefreshhelpers,
     handle_slowmode,
-    send_questions,
     expire_sessions,
     populate_cache,
     resetdmprefs,
+    refresh_question_pools,
+    sweep_practice_keys,
+    send_infraction_report,
+    update_leaderboard,
 ]
 
 
@@ -43,22 +48,27 @@ async def on_ready():
     await bot.change_presence(
         activity=discord.Activity(type=discord.ActivityType.watching, name="r/IGCSE")
     ) 
+    await ensure_indexes()
+    # infraction_totals starts out empty; /history and the infraction report
+    # read nothing else.
+    seeded = await punishdb.seed_infraction_totals()
+    if seeded is not None:
+        print(f"Seeded infraction totals for {seeded} users.")
+    await gpdb.load_all()
     await smdb.populate_cache()
+    await scheduler.start()
+    if PROFILER_INTERVAL_MS:
+        profiler.start(PROFILER_INTERVAL_MS)
+    if LOOP_WATCHDOG_MS:
+        watchdog.start(LOOP_WATCHDOG_MS)
     for loop in loops:
         if loop and not loop.is_running():
             loop.start()
-            
-    views = View.find().all()
-    for view in views:
-        bot.add_view(
-            MCQButtonsView(view["view_id"]), message_id=int(view["message_id"])
-        )
-    client = pymongo.MongoClient(LINK)
+
+    # Sessions that were between questions when the bot went down.
+    await dispatch_idle_sessions()
     guild = bot.get_guild(GUILD_ID)
-    db = client.IGCSEBot
-    prefs = db["guild_preferences"]
-    result = prefs.find_one({"guild_id": GUILD_ID})
-    botlogid = result["botlogs_channel"]
+    botlogid = await gpdb.get_pref("botlogs_channel", GUILD_ID)
     botlogs = bot.get_channel(botlogid)
     if botlogs:
         user = bot.user
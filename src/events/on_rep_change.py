@@ -0,0 +1,11 @@
+from bot import bot
+from utils.constants import GUILD_ID
+from utils.leaderboard import leaderboard_role
+
+
+# Dispatched as "rep_change" with (guild, user id, new rep) wherever rep is
+# given, changed or deleted.
+@bot.event
+async def on_rep_change(guild, user_id, rep):
+    if guild.id == GUILD_ID:
+        leaderboard_role.rep_changed(guild, user_id, rep)
@@ -1 +1 @@
-sticky_channels = []
+sticky_channels = set()
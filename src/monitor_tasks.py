@@ -1,18 +1,41 @@
 from bot import bot, discord, tasks, pymongo
-from utils.constants import LINK, GUILD_ID, FORCED_MUTE_ROLE, MODLOG_CHANNEL_ID
+from utils.constants import (
+    GUILD_ID,
+    FORCED_MUTE_ROLE,
+    MODLOG_CHANNEL_ID,
+    QUESTION_POOL_REFRESH_MINUTES,
+    PRACTICE_SWEEP_MINUTES,
+    INFRACTION_REPORT_TIMES,
+    INFRACTION_REPORT_THRESHOLD,
+    INFRACTION_REPORT_CHANNEL_ID,
+    LEADERBOARD_SYNC_MINUTES,
+)
 import time
+import asyncio
 import traceback
 from utils.data import AUTO_SLOWMODE_CHANNELS, helper_roles
-from schemas.redis import Session, Question, View
-from commands.practice.ui import MCQButtonsView
+from schemas.redis import Session
 from commands.practice import close_session
+from commands.practice.lifecycle import purge_session, sweeper
 import datetime
-from utils.mongodb import smdb, gpdb
+from utils.mongodb import (
+    smdb,
+    gpdb,
+    punishdb,
+    get_db,
+    run_in_executor,
+    run_redis,
+    questionsdb,
+)
+from utils.members import resolve_members
+from utils.leaderboard import leaderboard_role
+from utils.scheduler import scheduler
+from utils.metrics import metrics
 
 
 async def togglechannellock(channel_id, guild_id, unlock, *, unlocktime=0):
     everyone = bot.get_guild(guild_id).default_role
-    mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", guild_id)) 
+    mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", guild_id)) 
     timern = int(time.time()) + 1
     channel = bot.get_channel(channel_id)
     overwrite = channel.overwrites_for(everyone)
@@ -61,7 +84,7 @@ async def togglechannellock(channel_id, guild_id, unlock, *, unlocktime=0):
             if mod_log_channel:
                 await mod_log_channel.send(embed=embed)
             await channel.send("Channel has been locked.")
-            time.sleep(1)
+            await asyncio.sleep(1)
             await channel.send(f"Unlocking channel <t:{unlocktime}:R>.")
 
     except Exception:
@@ -70,7 +93,7 @@ async def togglechannellock(channel_id, guild_id, unlock, *, unlocktime=0):
 
 
 async def toggleforumlock(thread_id, guild_id, unlock, unlocktime):
-    mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", guild_id)) 
+    mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", guild_id)) 
     timern = int(time.time()) + 1
     thread = bot.get_channel(thread_id)
     try:
@@ -116,7 +139,7 @@ async def toggleforumlock(thread_id, guild_id, unlock, unlocktime):
             if mod_log_channel:
                 await mod_log_channel.send(embed=embed)
             await thread.send("Thread has been locked.")
-            time.sleep(1)
+            await asyncio.sleep(1)
             await thread.send(f"Unlocking thread <t:{unlocktime}:R>.")
 
     except Exception as e:
@@ -125,9 +148,10 @@ async def toggleforumlock(thread_id, guild_id, unlock, unlocktime):
 
 
 @tasks.loop(hours=720)
+@metrics.timed("loop:autorefreshhelpers")
 async def autorefreshhelpers():
     changed = []
-    mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", GUILD_ID)) 
+    mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", GUILD_ID)) 
     timenow = int(time.time()) + 1
     for chnl, role in helper_roles.items():
         try:
@@ -176,100 +200,148 @@ async def autorefreshhelpers():
             await mod_log_channel.send(embed=embed)
 
 
-@tasks.loop(seconds=20)
-async def checklock():
-    client = pymongo.MongoClient(LINK)
-    db = client.IGCSEBot
-    clocks = db["channellock"]
-    flocks = db["forumlock"]
-    try:
-        results = clocks.find({"resolved": False})
-        for result in results:
-            if result["time"] <= time.time():
-                ult = clocks.find_one({"_id": "u" + result["_id"][1:]})["time"]
-                await togglechannellock(
-                    result["channel_id"], result["guild_id"], result["unlock"], unlocktime=ult
+def load_locks(collection):
+    async def load():
+        results = await run_in_executor(
+            lambda: list(
+                get_db("background")[collection].find(
+                    {"resolved": False}, {"time": 1}
                 )
+            )
+        )
+        return [(result["time"], result["_id"]) for result in results]
 
-                clocks.delete_one({"_id": result["_id"]})
+    return load
 
-        results = flocks.find({"resolved": False})
-        for result in results:
-            if result["time"] <= time.time():
-                ult = flocks.find_one({"_id": "u" + result["_id"][1:]})["time"]
-                await toggleforumlock(
-                    result["thread_id"], result["guild_id"], result["unlock"], unlocktime=ult
-                )
-                flocks.delete_one({"_id": result["_id"]})
 
-    except Exception:
-        print(traceback.format_exc())
+scheduler.loader("channellock")(load_locks("channellock"))
+scheduler.loader("forumlock")(load_locks("forumlock"))
+
+
+@scheduler.handler("channellock")
+async def run_channellock(lock_id):
+    clocks = get_db("background")["channellock"]
+    result = await run_in_executor(
+        clocks.find_one, {"_id": lock_id, "resolved": False}
+    )
+    if not result:
+        return
+    ult = (await run_in_executor(clocks.find_one, {"_id": "u" + lock_id[1:]}))["time"]
+    await togglechannellock(
+        result["channel_id"], result["guild_id"], result["unlock"], unlocktime=ult
+    )
+    await run_in_executor(clocks.delete_one, {"_id": lock_id})
+
+
+@scheduler.handler("forumlock")
+async def run_forumlock(lock_id):
+    flocks = get_db("background")["forumlock"]
+    result = await run_in_executor(
+        flocks.find_one, {"_id": lock_id, "resolved": False}
+    )
+    if not result:
+        return
+    ult = (await run_in_executor(flocks.find_one, {"_id": "u" + lock_id[1:]}))["time"]
+    await toggleforumlock(
+        result["thread_id"], result["guild_id"], result["unlock"], unlocktime=ult
+    )
+    await run_in_executor(flocks.delete_one, {"_id": lock_id})
+
 
 @tasks.loop(hours=24)
+@metrics.timed("loop:resetdmprefs")
 async def resetdmprefs():
     timern = int(time.time()) + 1
-    client = pymongo.MongoClient(LINK)
-    db = client.IGCSEBot
-    dmservers = db["dm_server_prefs"]
-    results = dmservers.find({"resolved": False})
-    for result in results:
-        if result["deleted_time"] <= timern:
-            dmservers.delete_one({"_id": result["_id"]})
+    dmservers = get_db("background")["dm_server_prefs"]
+    await run_in_executor(
+        dmservers.delete_many, {"resolved": False, "deleted_time": {"$lte": timern}}
+    )
 
-@tasks.loop(seconds=20)
-async def checkmute():
-    client = pymongo.MongoClient(LINK)
-    db = client.IGCSEBot
-    mute = db["mute"]
+
+@scheduler.loader("mute")
+async def load_mutes():
+    results = await run_in_executor(
+        lambda: list(
+            get_db("background")["mute"].find({"muted": True}, {"unmute_time": 1})
+        )
+    )
+    return [(int(result["unmute_time"]), result["_id"]) for result in results]
+
+
+@scheduler.handler("mute")
+async def run_unmute(mute_id):
+    mute = get_db("background")["mute"]
+    result = await run_in_executor(mute.find_one, {"_id": mute_id, "muted": True})
+    if not result:
+        return
     timern = int(time.time()) + 1
-    results = mute.find({"muted": True})
-    for result in results:
-        try:
-            if int(result["unmute_time"]) <= timern:
-                user_id = int(result["user_id"])
-                guild_id = int(result["guild_id"])
-                mod_log_channel = bot.get_channel(gpdb.get_pref("modlog_channel", guild_id)) 
-                guild = bot.get_guild(guild_id)
-                # The user ID may not be present in cache.
-                try:
-                    user = guild.get_member(user_id)
-                    if user is None:
-                        mute.delete_many({"user_id": str(user_id)})
-                        return
-                    forced_mute_role = guild.get_role(FORCED_MUTE_ROLE)
-                    if forced_mute_role not in user.roles:
-                        mute.delete_many({"user_id": str(user_id)})
-                        return
-                    await user.remove_roles(forced_mute_role)
-                    # mute.update_one({"_id": result["_id"]}, {"$set": {"muted": False}})
-                    embed = discord.Embed(
-                        description="Go Study Mode Deactivated",
-                        colour=discord.Colour.green(),
-                    )
-                    embed.set_author(
-                        name="MongoDB#0082",
-                        icon_url="https://cdn.discordapp.com/attachments/947859228649992213/1196753678342819933/mongodb.png?ex=65b8c6b7&is=65a651b7&hm=db7fdb12435ba54299497dfb26f65dac5993caa8b48b976cf01238233c54a508&",
-                    )
-                    embed.add_field(name="User", value=f"{user.mention}", inline=False)
-                    embed.add_field(name="Date", value=f"<t:{timern}:F>", inline=False)
-                    embed.add_field(
-                        name="ID",
-                        value=f"```py\nUser = {bot.user.id}\nRole = {FORCED_MUTE_ROLE}```",
-                        inline=False,
-                    )
-                    embed.set_footer(
-                        text=f"{bot.user}", icon_url=bot.user.display_avatar.url
-                    )
-                    if mod_log_channel:
-                        await mod_log_channel.send(embed=embed)
-                    mute.delete_one({"_id": result["_id"]})
-                except Exception:
-                    print(traceback.format_exc())
-        except Exception:
-            print(traceback.format_exc())
+    user_id = int(result["user_id"])
+    guild_id = int(result["guild_id"])
+    mod_log_channel = bot.get_channel(await gpdb.get_pref("modlog_channel", guild_id)) 
+    guild = bot.get_guild(guild_id)
+    # The user ID may not be present in cache.
+    user = guild.get_member(user_id)
+    if user is None:
+        await run_in_executor(mute.delete_many, {"user_id": str(user_id)})
+        return
+    forced_mute_role = guild.get_role(FORCED_MUTE_ROLE)
+    if forced_mute_role not in user.roles:
+        await run_in_executor(mute.delete_many, {"user_id": str(user_id)})
+        return
+    await user.remove_roles(forced_mute_role)
+    # mute.update_one({"_id": result["_id"]}, {"$set": {"muted": False}})
+    embed = discord.Embed(
+        description="Go Study Mode Deactivated",
+        colour=discord.Colour.green(),
+    )
+    embed.set_author(
+        name="MongoDB#0082",
+        icon_url="https://cdn.discordapp.com/attachments/947859228649992213/1196753678342819933/mongodb.png?ex=65b8c6b7&is=65a651b7&hm=db7fdb12435ba54299497dfb26f65dac5993caa8b48b976cf01238233c54a508&",
+    )
+    embed.add_field(name="User", value=f"{user.mention}", inline=False)
+    embed.add_field(name="Date", value=f"<t:{timern}:F>", inline=False)
+    embed.add_field(
+        name="ID",
+        value=f"```py\nUser = {bot.user.id}\nRole = {FORCED_MUTE_ROLE}```",
+        inline=False,
+    )
+    embed.set_footer(
+        text=f"{bot.user}", icon_url=bot.user.display_avatar.url
+    )
+    if mod_log_channel:
+        await mod_log_channel.send(embed=embed)
+    await run_in_executor(mute.delete_one, {"_id": result["_id"]})
+
+
+@scheduler.loader("stick")
+async def load_sticks():
+    return [
+        (sticky["stick_time"], str(sticky["_id"]))
+        for sticky in await smdb.timed_stickies()
+        if not sticky["enabled"] and sticky["unstick_time"] > time.time()
+    ]
+
+
+@scheduler.loader("unstick")
+async def load_unsticks():
+    return [
+        (sticky["unstick_time"], str(sticky["_id"]))
+        for sticky in await smdb.timed_stickies()
+    ]
+
+
+@scheduler.handler("stick")
+async def run_stick(identifier):
+    await smdb.enable_timed_sticky(identifier)
+
+
+@scheduler.handler("unstick")
+async def run_unstick(identifier):
+    await smdb.expire_timed_sticky(identifier)
 
 
 @tasks.loop(seconds=20)
+@metrics.timed("loop:handle_slowmode")
 async def handle_slowmode():
     for channel_id in AUTO_SLOWMODE_CHANNELS:
         slowmode = 3
@@ -332,71 +404,134 @@ async def handle_slowmode():
             await channel.edit(slowmode_delay=slowmode)
 
 
-@tasks.loop(seconds=5)
-async def send_questions():
-    sessions = Session.find(
-        Session.paused == 0 and Session.currently_solving == "none"
-    ).all()
-    for session in sessions:
-        thread = bot.get_channel(int(session["thread_id"]))
-        if not thread:
-            continue
-
-        questions = list(
-            filter(
-                lambda x: x["solved"] == 0,
-                Question.find(Question.session_id == session.session_id).all(),
-            )
-        )
-
-        if len(questions) == 0 or not questions:
-            await close_session(
-                session, "No more questions left! Ending the session..."
-            )
-            continue
-
-        question = questions[0]
-
-        session["currently_solving"] = question.question_name
-        session.save()
+async def fetch_session_thread(session: Session):
+    """The session's thread, or None only if Discord says it no longer exists.
 
-        question_number = (session["limit"] - len(questions)) + 1
-        embeds = []
-        for qs in question["questions"]:
-            embed = discord.Embed()
-            if len(embeds) == 0:
-                embed.title = f"{question['question_name']}".replace(
-                    f"_{session['session_id']}", ""
-                )
-                embed.set_footer(text=f"Question {question_number}/{session['limit']}")
-            embed.set_image(
-                url=f"https://pub-8153dcb2290449f2924ed014b10896ee.r2.dev/{qs}"
-            )
-            embeds.append(embed)
-
-        mcq = MCQButtonsView(question["question_name"])
-        mcq_msg = await thread.send(embeds=embeds, view=mcq)
-        bot.add_view(mcq, message_id=mcq_msg.id)
-        view = View(view_id=question["question_name"], message_id=mcq_msg.id)
-        view.save()
+    A thread missing from the cache (after a reconnect, or once archived) is
+    fetched; other HTTP errors propagate so the session isn't purged on them.
+    """
+    thread = bot.get_channel(int(session["thread_id"]))
+    if thread:
+        return thread
+    try:
+        return await bot.fetch_channel(int(session["thread_id"]))
+    except discord.NotFound:
+        return None
 
 
 @tasks.loop(minutes=2)
+@metrics.timed("loop:expire_sessions")
 async def expire_sessions():
     sessions = Session.find(Session.expire_time <= int(time.time()) + 600).all()
     for session in sessions:
-        if session.expire_time <= int(time.time()):
+        try:
+            thread = await fetch_session_thread(session)
+        except discord.HTTPException:
+            continue
+        if not thread:
+            await run_redis(purge_session, session)
+        elif session.expire_time <= int(time.time()):
             await close_session(session, "Session expired...")
         else:
-            thread = bot.get_channel(int(session["thread_id"]))
-            if not thread:
-                Session.delete(session["session_id"])
-                continue
             await thread.send(
                 f"This session will expire in <t:{session['expire_time']}:R>."
             )
 
 
+@tasks.loop(minutes=PRACTICE_SWEEP_MINUTES)
+@metrics.timed("loop:sweep_practice_keys")
+async def sweep_practice_keys():
+    live = {}
+    purged = 0
+    for session in await run_redis(lambda: Session.find().all()):
+        try:
+            thread = await fetch_session_thread(session)
+        except discord.HTTPException:
+            # Can't tell; keep it until a sweep that can.
+            thread = True
+        if thread:
+            live[session.session_id] = session
+        else:
+            await run_redis(purge_session, session)
+            purged += 1
+    await run_redis(sweeper.sweep, live, purged)
+
+
 @tasks.loop(minutes=1)
+@metrics.timed("loop:populate_cache")
 async def populate_cache():
     await smdb.populate_cache()
+
+
+@tasks.loop(minutes=QUESTION_POOL_REFRESH_MINUTES)
+@metrics.timed("loop:refresh_question_pools")
+async def refresh_question_pools():
+    await questionsdb.build_pools()
+
+
+@tasks.loop(time=INFRACTION_REPORT_TIMES)
+@metrics.timed("loop:send_infraction_report")
+async def send_infraction_report():
+    # An unhandled exception would stop the loop until the next restart.
+    try:
+        start = time.perf_counter()
+        guild = bot.get_guild(GUILD_ID)
+        action_channel = guild.get_channel(
+            INFRACTION_REPORT_CHANNEL_ID
+        ) or await guild.fetch_channel(INFRACTION_REPORT_CHANNEL_ID)
+        totals = await punishdb.get_users_over(GUILD_ID, INFRACTION_REPORT_THRESHOLD)
+        members = await resolve_members(guild, [int(total["user_id"]) for total in totals])
+
+        embeds = []
+        for total in totals:
+            # Only people still in the server are reported.
+            member = members.get(int(total["user_id"]))
+            if not member:
+                continue
+            if not embeds or len(embeds[-1].fields) == 25:
+                embeds.append(
+                    discord.Embed(
+                        title="Infraction Points Leaderboard"
+                        + (f" Page {len(embeds) + 1}" if embeds else ""),
+                        description=f"The following users have accumulated {INFRACTION_REPORT_THRESHOLD} or more infraction points.",
+                        colour=0x1E293B,
+                    )
+                )
+            embeds[-1].add_field(
+                name=f"{member.name} ({member.id})",
+                value=f"Total points: {total['points']}",
+                inline=False,
+            )
+
+        # A message can carry at most 10 embeds and 6000 characters across them.
+        batch = []
+        for embed in embeds:
+            if batch and (len(batch) == 10 or sum(map(len, batch)) + len(embed) > 6000):
+                await action_channel.send(embeds=batch)
+                batch = []
+            batch.append(embed)
+        if batch:
+            await action_channel.send(embeds=batch)
+        print(
+            f"Infraction report: {sum(len(embed.fields) for embed in embeds)} users "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+    except Exception:
+        metrics.record_error("loop:send_infraction_report")
+        print(traceback.format_exc())
+
+
+@tasks.loop(minutes=LEADERBOARD_SYNC_MINUTES)
+@metrics.timed("loop:update_leaderboard")
+async def update_leaderboard():
+    start = time.perf_counter()
+    try:
+        added, removed = await leaderboard_role.sync(bot.get_guild(GUILD_ID))
+    except Exception:
+        metrics.record_error("loop:update_leaderboard")
+        print(traceback.format_exc())
+        return
+    print(
+        f"Leaderboard checked in {time.perf_counter() - start:.2f}s "
+        f"({added} added, {removed} removed)"
+    )
@@ -1,5 +1,6 @@
 from redis_om import Field
 from .ExtendedModel import ExtendedModel
+from typing import Optional
 
 
 class StickyMessage(ExtendedModel):
@@ -8,3 +9,5 @@ class StickyMessage(ExtendedModel):
     message_id: str = Field(index=True)
     content: list[dict[str, object]]
     enabled: int = Field(index=True)
+    stick_time: Optional[int] = None
+    unstick_time: Optional[int] = None
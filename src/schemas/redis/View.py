@@ -3,6 +3,7 @@ from .ExtendedModel import ExtendedModel
 
 
 class View(ExtendedModel):
-    # This exists for the sole purpose of making views persistent.
+    # No longer written: MCQ buttons are routed by custom ID. Kept so the
+    # practice key sweeper can find and drop keys left by older versions.
     view_id: str = Field(primary_key=True)
     message_id: str = Field(index=True)
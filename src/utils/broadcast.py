@@ -0,0 +1,93 @@
+from typing import NamedTuple
+from collections import Counter
+from bot import bot, discord
+from utils.constants import BOT_NEWS_CONCURRENCY
+from utils.mongodb import gpdb
+from utils.metrics import metrics
+import asyncio
+import io
+import time
+
+
+class BroadcastReport(NamedTuple):
+    # guild -> "sent", "created" (a bot-news channel had to be made first),
+    # "forbidden" or "failed (<HTTP status or error type>)"
+    statuses: dict[discord.Guild, str]
+    elapsed: float
+
+    @property
+    def delivered(self) -> int:
+        return sum(
+            status in ("sent", "created") for status in self.statuses.values()
+        )
+
+    def embed(self) -> discord.Embed:
+        embed = discord.Embed(
+            title="Bot news broadcast",
+            description=f"Delivered to {self.delivered}/{len(self.statuses)} guilds in {self.elapsed:.2f}s.",
+            colour=discord.Colour.green()
+            if self.delivered == len(self.statuses)
+            else discord.Colour.orange(),
+        )
+        for status, count in Counter(self.statuses.values()).most_common():
+            embed.add_field(name=status.capitalize(), value=str(count))
+        return embed
+
+    def file(self) -> discord.File:
+        lines = [
+            f"{guild.name} ({guild.id}): {status}"
+            for guild, status in sorted(
+                self.statuses.items(), key=lambda item: item[1]
+            )
+        ]
+        return discord.File(
+            io.BytesIO("\n".join(lines).encode()), filename="broadcast.txt"
+        )
+
+
+async def deliver(
+    guild: discord.Guild,
+    channel_id: int | None,
+    content: str,
+    semaphore: asyncio.Semaphore,
+) -> str:
+    # nextcord already waits out 429s per route; the semaphore keeps the number
+    # of guilds being hit at once low enough not to trip the global limit.
+    async with semaphore:
+        try:
+            channel = bot.get_channel(channel_id) if channel_id else None
+            status = "sent"
+            if channel is None:
+                channel = await guild.create_text_channel("bot-news")
+                await gpdb.set_pref("botnews_channel", channel.id, guild.id)
+                status = "created"
+            await channel.send(content=content)
+            return status
+        except discord.Forbidden:
+            return "forbidden"
+        except discord.HTTPException as error:
+            return f"failed ({error.status})"
+        # Anything else (a Mongo error, a stored channel that can't be sent
+        # to) is reported for this guild instead of aborting the broadcast.
+        except Exception as error:
+            return f"failed ({type(error).__name__})"
+
+
+@metrics.timed("broadcast:bot_news")
+async def broadcast_news(content: str) -> BroadcastReport:
+    """Sends content to the bot-news channel of every guild the bot is in."""
+    start = time.perf_counter()
+    guilds = list(bot.guilds)
+    prefs = await gpdb.get_prefs_many([guild.id for guild in guilds])
+    semaphore = asyncio.Semaphore(BOT_NEWS_CONCURRENCY)
+    statuses = await asyncio.gather(
+        *(
+            deliver(
+                guild, prefs[guild.id].get("botnews_channel"), content, semaphore
+            )
+            for guild in guilds
+        )
+    )
+    return BroadcastReport(
+        dict(zip(guilds, statuses)), time.perf_counter() - start
+    )
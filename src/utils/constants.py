@@ -1,4 +1,5 @@
 import os
+import datetime
 import pymongo
 from dotenv import load_dotenv
 
@@ -6,6 +7,68 @@ load_dotenv()
 TOKEN = os.environ.get("IGCSEBOT_TOKEN")
 LINK = os.environ.get("MONGO_LINK")
 BETA = os.environ.get("BETA") != "False"
+# Seconds before a cached guild preferences document is re-read (0 = never expire).
+PREFERENCES_CACHE_TTL = int(os.environ.get("PREFERENCES_CACHE_TTL", 600))
+# Seconds to buffer rep increments before a bulk write (0 = write each one immediately).
+REP_WRITE_BEHIND_INTERVAL = float(os.environ.get("REP_WRITE_BEHIND_INTERVAL", 0))
+# Seconds a sticky channel must be quiet before its sticky is re-posted.
+STICKY_QUIET_WINDOW = float(os.environ.get("STICKY_QUIET_WINDOW", 5))
+# Messages that must bury a sticky before it is re-posted at all.
+STICKY_MIN_MESSAGES = int(os.environ.get("STICKY_MIN_MESSAGES", 4))
+# Messages after which a sticky is re-posted even if the channel never goes quiet.
+STICKY_MAX_MESSAGES = int(os.environ.get("STICKY_MAX_MESSAGES", 10))
+# How far each sticky cache sync re-reads behind the previous one's start.
+STICKY_SYNC_OVERLAP = datetime.timedelta(
+    seconds=int(os.environ.get("STICKY_SYNC_OVERLAP", 30))
+)
+# Stack sampling interval for the built-in profiler (0 = profiler off).
+PROFILER_INTERVAL_MS = float(os.environ.get("PROFILER_INTERVAL_MS", 0))
+# Minutes between rebuilds of the in-memory practice question pools.
+QUESTION_POOL_REFRESH_MINUTES = int(os.environ.get("QUESTION_POOL_REFRESH_MINUTES", 60))
+# Seconds practice keys outlive their session's expire_time before Redis drops them.
+PRACTICE_KEY_GRACE = int(os.environ.get("PRACTICE_KEY_GRACE", 3600))
+# Seconds an unfinished /practice new setup is kept.
+TEMP_SESSION_TTL = int(os.environ.get("TEMP_SESSION_TTL", 1800))
+# Minutes between sweeps for orphaned practice keys.
+PRACTICE_SWEEP_MINUTES = int(os.environ.get("PRACTICE_SWEEP_MINUTES", 30))
+# Guilds a bot-news broadcast sends to at the same time.
+BOT_NEWS_CONCURRENCY = int(os.environ.get("BOT_NEWS_CONCURRENCY", 5))
+# Seconds before an outgoing HTTP request is abandoned.
+HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", 10))
+# Extra attempts for HTTP requests that fail with a timeout, 429 or 5xx.
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", 2))
+# Open connections the shared HTTP client keeps at most.
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", 20))
+# Log callbacks that block the event loop longer than this (0 turns it off).
+LOOP_WATCHDOG_MS = int(os.environ.get("LOOP_WATCHDOG_MS", 0))
+# Short links kept in memory in front of the short_links collection.
+SHORT_LINK_CACHE_SIZE = int(os.environ.get("SHORT_LINK_CACHE_SIZE", 1024))
+# Seconds a resolved member name is reused before being looked up again.
+MEMBER_NAME_CACHE_TTL = int(os.environ.get("MEMBER_NAME_CACHE_TTL", 3600))
+# Times of day (UTC, comma separated HH:MM) the infraction points report is posted.
+INFRACTION_REPORT_TIMES = [
+    datetime.time.fromisoformat(value.strip()).replace(tzinfo=datetime.timezone.utc)
+    for value in os.environ.get("INFRACTION_REPORT_TIMES", "00:00").split(",")
+]
+# Infraction points from which a user shows up in the report.
+INFRACTION_REPORT_THRESHOLD = int(os.environ.get("INFRACTION_REPORT_THRESHOLD", 10))
+# Minutes between full syncs of the rep leaderboard role; rep changes that
+# reach the top trigger one sooner.
+LEADERBOARD_SYNC_MINUTES = int(os.environ.get("LEADERBOARD_SYNC_MINUTES", 60))
+# Number of top rep holders given the leaderboard role.
+LEADERBOARD_SIZE = int(os.environ.get("LEADERBOARD_SIZE", 3))
+# Seconds rep changes are collected for before the leaderboard role is synced.
+LEADERBOARD_SYNC_DELAY = float(os.environ.get("LEADERBOARD_SYNC_DELAY", 5))
+
+# Shared MongoClient pool (see utils/mongodb.py).
+MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", 1))
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", 20))
+MONGO_TIMEOUT_MS = int(os.environ.get("MONGO_TIMEOUT_MS", 10000))
+MONGO_READ_PREFERENCES = {
+    "default": "primary",
+    "background": os.environ.get("MONGO_BACKGROUND_READ_PREFERENCE", "primaryPreferred"),
+    "analytics": os.environ.get("MONGO_ANALYTICS_READ_PREFERENCE", "secondaryPreferred"),
+}
 
 MAIN_BOT_ID = 861445044790886467
 BETA_BOT_ID = 947857467726000158
@@ -27,6 +90,7 @@ MODMAIL_LOGS_ID = None
 FORUMTHREAD_ID = None
 CREATEDM_ID = None
 HOTM_VOTING_CHANNEL = None
+INFRACTION_REPORT_CHANNEL_ID = 1209829023254057022
 
 FORCED_MUTE_ROLE = 1188519534177566760
 MODERATOR_ROLE = 578170681670369290
@@ -38,4 +102,5 @@ CHAT_MODERATOR_ROLE = 1071458671835488358
 BOT_DEVELOPER_ROLE = 854000415074025493
 IGCSE_HELPER_ROLE = 696415516893380700
 AL_HELPER_ROLE = 869584464324468786
-guild_HELPER_ROLE = IGCSE_HELPER_ROLE, AL_HELPER_ROLE
\ No newline at end of file
+guild_HELPER_ROLE = IGCSE_HELPER_ROLE, AL_HELPER_ROLE
+LEADERBOARD_ROLE = 862192631261298717
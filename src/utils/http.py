@@ -0,0 +1,100 @@
+from typing import NamedTuple
+from utils.constants import HTTP_TIMEOUT, HTTP_RETRIES, HTTP_MAX_CONNECTIONS
+from utils.metrics import awaiting
+import aiohttp
+import asyncio
+import json
+
+# Statuses worth another attempt; anything else is returned to the caller.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class Response(NamedTuple):
+    status: int
+    body: bytes
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class HTTPClient:
+    """One pooled aiohttp session for every outgoing request the bot makes.
+
+    Requests time out after HTTP_TIMEOUT seconds and are retried with
+    exponential backoff on connection errors, timeouts and 429/5xx responses,
+    honouring Retry-After when the server sends one.
+    """
+
+    def __init__(
+        self,
+        timeout: float = HTTP_TIMEOUT,
+        retries: int = HTTP_RETRIES,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+    ):
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.max_connections = max_connections
+        self.session: aiohttp.ClientSession | None = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so it binds to the running event loop.
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+            )
+        return self.session
+
+    async def request(self, method: str, url: str, **kwargs) -> Response:
+        with awaiting("http"):
+            for attempt in range(self.retries + 1):
+                delay = 0.5 * 2**attempt
+                try:
+                    async with self.get_session().request(
+                        method, url, **kwargs
+                    ) as response:
+                        body = await response.read()
+                        if (
+                            response.status not in RETRY_STATUSES
+                            or attempt == self.retries
+                        ):
+                            return Response(response.status, body)
+                        retry_after = response.headers.get("Retry-After", "")
+                        if retry_after.isdigit():
+                            delay = max(delay, int(retry_after))
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if attempt == self.retries:
+                        raise
+                await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs) -> Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def get_json(self, url: str, **kwargs):
+        return (await self.get(url, **kwargs)).json()
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+
+http = HTTPClient()
+
+
+async def shorten_url(url: str) -> str:
+    """Shortens url with TinyURL, falling back to url itself if that fails."""
+    try:
+        response = await http.get(
+            "https://tinyurl.com/api-create.php", params={"url": url}
+        )
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return url
+    return response.text.strip() if response.ok else url
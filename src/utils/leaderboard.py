@@ -0,0 +1,112 @@
+from bot import discord
+from utils.constants import LEADERBOARD_ROLE, LEADERBOARD_SIZE, LEADERBOARD_SYNC_DELAY
+from utils.mongodb import repdb
+from utils.metrics import metrics
+from utils.members import resolve_members
+import asyncio
+import traceback
+
+
+class LeaderboardRole:
+    """Keeps LEADERBOARD_ROLE on exactly the top LEADERBOARD_SIZE rep holders.
+
+    A sync only reads the top rows (served by the (guild_id, rep) index) and
+    adds or removes the role where the holders differ from the leaderboard.
+    Rep changes that can't move anyone in or out of the top are ignored, and
+    the rest are coalesced into one sync per LEADERBOARD_SYNC_DELAY seconds.
+    """
+
+    def __init__(
+        self,
+        role_id: int = LEADERBOARD_ROLE,
+        size: int = LEADERBOARD_SIZE,
+        delay: float = LEADERBOARD_SYNC_DELAY,
+    ):
+        self.role_id = role_id
+        self.size = size
+        self.delay = delay
+        # user id -> rep as of the last sync, None until the first one
+        self.top: dict[int, int] | None = None
+        self.lock = asyncio.Lock()
+        self.sync_task: asyncio.Task | None = None
+        # Set by changes that arrive while a sync is running, which may already
+        # have read the leaderboard; that sync is then followed by another.
+        self.dirty = False
+
+    def affects_top(self, user_id: int, rep: int) -> bool:
+        if self.top is None or user_id in self.top or len(self.top) < self.size:
+            return True
+        return rep >= min(self.top.values())
+
+    def rep_changed(self, guild: discord.Guild, user_id: int, rep: int):
+        if not self.affects_top(user_id, rep):
+            return
+        if self.sync_task is None or self.sync_task.done():
+            self.sync_task = asyncio.create_task(self.delayed_sync(guild))
+        else:
+            self.dirty = True
+
+    async def delayed_sync(self, guild: discord.Guild):
+        while True:
+            await asyncio.sleep(self.delay)
+            self.dirty = False
+            try:
+                await self.sync(guild)
+            except Exception:
+                print(traceback.format_exc())
+            if not self.dirty:
+                return
+
+    async def get_role(self, guild: discord.Guild) -> discord.Role | None:
+        role = guild.get_role(self.role_id)
+        if role is None:
+            roles = await guild.fetch_roles()
+            role = discord.utils.get(roles, id=self.role_id)
+        return role
+
+    @metrics.timed("leaderboard:sync")
+    async def sync(self, guild: discord.Guild) -> tuple[int, int]:
+        """Brings the role in line with the leaderboard.
+
+        Returns the number of members the role was added to and removed from.
+        """
+        async with self.lock:
+            leaderboard = await repdb.rep_leaderboard(guild.id, limit=self.size)
+            self.top = {item["user_id"]: item["rep"] for item in leaderboard}
+            role = await self.get_role(guild)
+            if role is None:
+                return 0, 0
+
+            holders = {member.id: member for member in role.members}
+            to_remove = [
+                member
+                for user_id, member in holders.items()
+                if user_id not in self.top
+            ]
+            # Members who left stay on the leaderboard until /leaderboard
+            # cleans them up; there is no one to give the role to.
+            members = await resolve_members(
+                guild, [user_id for user_id in self.top if user_id not in holders]
+            )
+            to_add = list(members.values())
+
+            results = await asyncio.gather(
+                *(
+                    member.remove_roles(role, reason="Left the rep leaderboard")
+                    for member in to_remove
+                ),
+                *(
+                    member.add_roles(role, reason="Reached the rep leaderboard")
+                    for member in to_add
+                ),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, discord.HTTPException):
+                    print(f"Leaderboard role update failed: {result}")
+                elif isinstance(result, BaseException):
+                    raise result
+            return len(to_add), len(to_remove)
+
+
+leaderboard_role = LeaderboardRole()
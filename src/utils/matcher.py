@@ -0,0 +1,44 @@
+from typing import NamedTuple
+import re
+
+
+class MessageMatch(NamedTuple):
+    text: str
+    thanks: bool
+    welcome: bool
+    rep_farm: bool
+
+
+THANKS, WELCOME, REP_FARM = 1, 2, 4
+
+# Every phrase the rep handlers and the rep-farm check look for, folded into a
+# single alternation. Each named group carries the flags its phrase sets.
+# Whole-token patterns come before the bare substrings they contain so that
+# "np" as a word counts as a welcome, not only as a rep-farm hit.
+PATTERNS = {
+    "welcome_exact": (r"\Awelcome\Z", WELCOME),
+    "welcome_token": (r"(?<!\S)(?:np!?|yw!?)(?!\S)", WELCOME | REP_FARM),
+    "thanks_token": (r"(?<!\S)ty(?!\S)", THANKS),
+    "thanks": (r"thank|thx|tysm|thnks|tanks|tyvm|ty!", THANKS | REP_FARM),
+    "welcome": (r"you're welcome|ur welcome|no problem", WELCOME | REP_FARM),
+    "rep_farm": (r"np|yw", REP_FARM),
+}
+MATCHER = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, (pattern, _) in PATTERNS.items())
+)
+ALL_FLAGS = THANKS | WELCOME | REP_FARM
+
+
+def classify(content: str) -> MessageMatch:
+    text = content.lower()
+    flags = 0
+    for match in MATCHER.finditer(text):
+        flags |= PATTERNS[match.lastgroup][1]
+        if flags == ALL_FLAGS:
+            break
+    return MessageMatch(
+        text=text,
+        thanks=bool(flags & THANKS),
+        welcome=bool(flags & WELCOME),
+        rep_farm=bool(flags & REP_FARM),
+    )
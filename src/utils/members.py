@@ -0,0 +1,57 @@
+from bot import discord, bot
+from .constants import MEMBER_NAME_CACHE_TTL
+import asyncio
+import time
+
+# (guild id, user id) -> (name, time it was resolved)
+names: dict[tuple[int, int], tuple[str, float]] = {}
+
+
+async def resolve_members(guild: discord.Guild, user_ids: list[int]) -> dict:
+    members = {}
+    missing = []
+    for user_id in user_ids:
+        member = guild.get_member(user_id)
+        if member:
+            members[user_id] = member
+        else:
+            missing.append(user_id)
+
+    # One gateway request per 100 uncached members instead of an HTTP
+    # fetch_member for each of them.
+    chunks = await asyncio.gather(
+        *(
+            guild.query_members(user_ids=missing[i : i + 100], limit=100)
+            for i in range(0, len(missing), 100)
+        ),
+        return_exceptions=True,
+    )
+    for chunk in chunks:
+        if isinstance(chunk, BaseException):
+            continue
+        for member in chunk:
+            members[member.id] = member
+    return members
+
+
+async def member_names(guild: discord.Guild, user_ids: set[int]) -> dict[int, str]:
+    """Names for user_ids, looking each distinct ID up at most once per TTL.
+
+    Users who left the guild fall back to the cached user, then to their ID.
+    """
+    now = time.monotonic()
+    result = {}
+    stale = []
+    for user_id in user_ids:
+        cached = names.get((guild.id, user_id))
+        if cached and now - cached[1] < MEMBER_NAME_CACHE_TTL:
+            result[user_id] = cached[0]
+        else:
+            stale.append(user_id)
+
+    members = await resolve_members(guild, stale)
+    for user_id in stale:
+        user = members.get(user_id) or bot.get_user(user_id)
+        result[user_id] = user.name if user else str(user_id)
+        names[(guild.id, user_id)] = (result[user_id], now)
+    return result
@@ -0,0 +1,232 @@
+from collections import Counter, defaultdict, deque
+from contextvars import ContextVar
+import asyncio
+import contextlib
+import functools
+import logging
+import sys
+import threading
+import time
+
+# Backends a handler can spend time awaiting; see awaiting().
+BACKENDS = ("mongodb", "redis", "http")
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class HandlerStats:
+    def __init__(self, samples: int = 1024):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        # A window of recent durations is enough for percentiles and keeps the
+        # memory per handler fixed.
+        self.durations = deque(maxlen=samples)
+        self.waits = dict.fromkeys(BACKENDS, 0.0)
+
+    def quantiles(self) -> dict[float, float]:
+        durations = sorted(self.durations)
+        if not durations:
+            return dict.fromkeys(QUANTILES, 0.0)
+        return {
+            q: durations[min(len(durations) - 1, int(q * len(durations)))]
+            for q in QUANTILES
+        }
+
+
+class Timing:
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.waits = dict.fromkeys(BACKENDS, 0.0)
+        # Waits on one backend that overlap (asyncio.gather shares the Timing
+        # of the task that started it) are charged once, for as long as any of
+        # them is in flight, so waits never exceed the handler's wall time.
+        self.in_flight = dict.fromkeys(BACKENDS, 0)
+        self.since = dict.fromkeys(BACKENDS, 0.0)
+
+
+current: ContextVar[Timing | None] = ContextVar("current_timing", default=None)
+
+
+class Metrics:
+    def __init__(self):
+        self.handlers: dict[str, HandlerStats] = defaultdict(HandlerStats)
+
+    def begin(self, name: str) -> Timing:
+        """Starts timing the rest of the current task; pair it with finish()."""
+        timing = Timing(name)
+        current.set(timing)
+        return timing
+
+    def end(self, timing: Timing, error: bool = False):
+        stats = self.handlers[timing.name]
+        elapsed = time.perf_counter() - timing.start
+        stats.count += 1
+        stats.total += elapsed
+        stats.durations.append(elapsed)
+        if error:
+            stats.errors += 1
+        for backend, waited in timing.waits.items():
+            stats.waits[backend] += waited
+
+    def finish(self):
+        timing = current.get()
+        if timing:
+            self.end(timing)
+            current.set(None)
+
+    def record_error(self, name: str):
+        self.handlers[name].errors += 1
+
+    def timed(self, name: str):
+        """Wraps a coroutine function so every call is counted and timed."""
+
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                timing = Timing(name)
+                token = current.set(timing)
+                error = False
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    error = True
+                    raise
+                finally:
+                    self.end(timing, error)
+                    current.reset(token)
+
+            return wrapper
+
+        return decorator
+
+    def prometheus(self) -> str:
+        lines = [
+            "# TYPE igcsebot_handler_calls_total counter",
+            "# TYPE igcsebot_handler_errors_total counter",
+            "# TYPE igcsebot_handler_latency_seconds summary",
+            "# TYPE igcsebot_handler_wait_seconds_total counter",
+        ]
+        for name, stats in sorted(self.handlers.items()):
+            label = f'handler="{name}"'
+            lines.append(f"igcsebot_handler_calls_total{{{label}}} {stats.count}")
+            lines.append(f"igcsebot_handler_errors_total{{{label}}} {stats.errors}")
+            for q, value in stats.quantiles().items():
+                lines.append(
+                    f"igcsebot_handler_latency_seconds"
+                    f'{{{label},quantile="{q}"}} {value:.6f}'
+                )
+            lines.append(
+                f"igcsebot_handler_latency_seconds_sum{{{label}}} {stats.total:.6f}"
+            )
+            lines.append(
+                f"igcsebot_handler_latency_seconds_count{{{label}}} {stats.count}"
+            )
+            for backend, waited in stats.waits.items():
+                lines.append(
+                    f"igcsebot_handler_wait_seconds_total"
+                    f'{{{label},backend="{backend}"}} {waited:.6f}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+@contextlib.contextmanager
+def awaiting(backend: str):
+    """Charges the time spent in the block to the running handler's backend wait."""
+    timing = current.get()
+    if timing is None:
+        yield
+        return
+    if not timing.in_flight[backend]:
+        timing.since[backend] = time.perf_counter()
+    timing.in_flight[backend] += 1
+    try:
+        yield
+    finally:
+        timing.in_flight[backend] -= 1
+        if not timing.in_flight[backend]:
+            timing.waits[backend] += time.perf_counter() - timing.since[backend]
+
+
+class SamplingProfiler:
+    """Samples the event loop thread's stack from a background thread.
+
+    Stacks are folded into "frame;frame;frame count" lines, which is the input
+    format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self):
+        self.samples = Counter()
+        self.interval = 0.0
+        self.thread: threading.Thread | None = None
+        self.target: int | None = None
+        self.running = threading.Event()
+
+    def start(self, interval_ms: float):
+        if self.thread and self.thread.is_alive():
+            return
+        self.interval = interval_ms / 1000
+        self.target = threading.get_ident()
+        self.running.set()
+        self.thread = threading.Thread(
+            target=self.sample, name="sampling-profiler", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        self.running.clear()
+
+    def sample(self):
+        while self.running.is_set():
+            frame = sys._current_frames().get(self.target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def folded(self) -> str:
+        return "\n".join(
+            f"{stack} {count}" for stack, count in self.samples.most_common()
+        )
+
+
+profiler = SamplingProfiler()
+
+
+class LoopWatchdog(logging.Handler):
+    """Logs callbacks that hold the event loop longer than a threshold.
+
+    This turns on asyncio's debug mode, which times every callback the loop
+    runs and warns about the ones slower than slow_callback_duration, naming
+    the coroutine or handle responsible. Debug mode has its own overhead, so
+    it is meant for hunting down blocking code, not for running all the time.
+    """
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.slow_callbacks = 0
+
+    def start(self, threshold_ms: float):
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = threshold_ms / 1000
+        logger = logging.getLogger("asyncio")
+        if self not in logger.handlers:
+            logger.addHandler(self)
+
+    def emit(self, record: logging.LogRecord):
+        message = record.getMessage()
+        if message.startswith("Executing"):
+            self.slow_callbacks += 1
+            message = f"Event loop blocked: {message}"
+        print(message)
+
+
+watchdog = LoopWatchdog()
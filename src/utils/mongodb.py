@@ -1,30 +1,182 @@
 from typing import Callable
 from bot import bot, discord, pymongo
-from utils.constants import LINK, DMS_CLOSED_CHANNEL_ID
+from utils.constants import (
+    LINK,
+    DMS_CLOSED_CHANNEL_ID,
+    PREFERENCES_CACHE_TTL,
+    REP_WRITE_BEHIND_INTERVAL,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_TIMEOUT_MS,
+    MONGO_READ_PREFERENCES,
+    STICKY_QUIET_WINDOW,
+    STICKY_MIN_MESSAGES,
+    STICKY_MAX_MESSAGES,
+    STICKY_SYNC_OVERLAP,
+    SHORT_LINK_CACHE_SIZE,
+)
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import asyncio
+import functools
 import time
+import bisect
+import random
 from schemas.redis import StickyMessage
+from utils.metrics import awaiting
+from utils.http import shorten_url
 import global_vars
 from bson import ObjectId
 
-client = pymongo.MongoClient(
-    LINK, server_api=pymongo.server_api.ServerApi("1"), minPoolSize=1
+
+class PoolMetrics(pymongo.monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.wait_time = 0.0
+        self.open_connections = 0
+        self.checked_out = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.open_connections -= 1
+
+    def connection_check_out_started(self, event):
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def connection_check_out_failed(self, event):
+        self.waiting -= 1
+        self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        self.waiting -= 1
+        self.checkouts += 1
+        self.checked_out += 1
+        # Only reported by pymongo 4.7+.
+        self.wait_time += getattr(event, "duration", 0) or 0
+
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+
+    def stats(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "avg_wait_ms": round(self.wait_time / self.checkouts * 1000, 3)
+            if self.checkouts
+            else 0,
+            "open_connections": self.open_connections,
+            "checked_out": self.checked_out,
+        }
+
+
+def read_preference(name: str):
+    try:
+        mode = pymongo.read_preferences.read_pref_mode_from_name(name)
+    except ValueError:
+        raise ValueError(f"{name!r} is not a MongoDB read preference") from None
+    return pymongo.read_preferences.make_read_preference(mode, None)
+
+
+class MongoRegistry:
+    """The one MongoClient for the process; workloads differ only in read preference."""
+
+    def __init__(self, link: str):
+        self.metrics = PoolMetrics()
+        self.client = pymongo.MongoClient(
+            link,
+            server_api=pymongo.server_api.ServerApi("1"),
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            connectTimeoutMS=MONGO_TIMEOUT_MS,
+            serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+            waitQueueTimeoutMS=MONGO_TIMEOUT_MS,
+            event_listeners=[self.metrics],
+        )
+        # Built up front so a misspelt preference fails at import rather than
+        # in whichever loop first asks for that workload.
+        self.read_preferences = {
+            workload: read_preference(name)
+            for workload, name in MONGO_READ_PREFERENCES.items()
+        }
+        self.databases = {}
+
+    def get_db(self, workload: str = "default"):
+        if workload not in self.databases:
+            self.databases[workload] = self.client.get_database(
+                "IGCSEBot", read_preference=self.read_preferences[workload]
+            )
+        return self.databases[workload]
+
+
+mongo = MongoRegistry(LINK)
+client = mongo.client
+get_db = mongo.get_db
+
+# pymongo is blocking, so every query is handed off to this pool instead of
+# running on the event loop and stalling the gateway for a network round trip.
+# One thread per pooled connection keeps threads from queueing on the pool.
+executor = ThreadPoolExecutor(
+    max_workers=MONGO_MAX_POOL_SIZE, thread_name_prefix="mongodb"
 )
 
 
+async def run_in_executor(func: Callable, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    with awaiting("mongodb"):
+        return await loop.run_in_executor(
+            executor, functools.partial(func, *args, **kwargs)
+        )
+
+
+async def run_redis(func: Callable, *args, **kwargs):
+    # redis-om is blocking too; it shares the executor but is timed separately.
+    loop = asyncio.get_running_loop()
+    with awaiting("redis"):
+        return await loop.run_in_executor(
+            executor, functools.partial(func, *args, **kwargs)
+        )
+
+
 class ReactionRolesDB:
     def __init__(self, client):
         self.client = client
         self.db = self.client.IGCSEBot
         self.reaction_roles = self.db.reaction_roles
 
-    def new_rr(self, data):
-        self.reaction_roles.insert_one(
-            {"reaction": data[0], "role": data[1], "message": data[2]}
+    async def new_rr(self, data):
+        await run_in_executor(
+            self.reaction_roles.insert_one,
+            {"reaction": data[0], "role": data[1], "message": data[2]},
         )
 
-    def get_rr(self, reaction, msg_id):
-        result = self.reaction_roles.find_one({"reaction": reaction, "message": msg_id})
+    async def get_rr(self, reaction, msg_id):
+        result = await run_in_executor(
+            self.reaction_roles.find_one, {"reaction": reaction, "message": msg_id}
+        )
         if result is None:
             return None
         else:
@@ -34,22 +186,62 @@ class ReactionRolesDB:
 rrdb = ReactionRolesDB(client)
 
 class GuildPreferencesDB:
-    def __init__(self, client):
+    def __init__(self, client, ttl: int = PREFERENCES_CACHE_TTL):
         self.client = client
         self.db = self.client.IGCSEBot
         self.pref = self.db.guild_preferences
+        # guild_id -> (preferences document, time it was loaded)
+        self.cache: dict[int, tuple[dict, float]] = {}
+        self.ttl = ttl
 
-    def set_pref(self, pref: str, pref_value, guild_id: int):
-        return self.pref.find_one_and_update(
-            {"guild_id": guild_id}, {"$set": {pref: pref_value}}, upsert=True
-        )
+    def _cache_doc(self, guild_id: int, document: dict | None):
+        self.cache[guild_id] = (document or {}, time.monotonic())
 
-    def get_pref(self, pref: str, guild_id: int):
-        result = self.pref.find_one({"guild_id": guild_id})
-        if result is None:
-            return None
+    def invalidate(self, guild_id: int = None):
+        if guild_id is None:
+            self.cache.clear()
         else:
-            return result.get(pref, None)
+            self.cache.pop(guild_id, None)
+
+    async def load_all(self):
+        documents = await run_in_executor(lambda: list(self.pref.find({})))
+        self.cache.clear()
+        for document in documents:
+            self._cache_doc(document["guild_id"], document)
+        return len(documents)
+
+    async def get_prefs_many(self, guild_ids: list[int]) -> dict[int, dict]:
+        """Preferences of several guilds, fetched in one query and cached."""
+        documents = await run_in_executor(
+            lambda: list(self.pref.find({"guild_id": {"$in": list(guild_ids)}}))
+        )
+        found = {document["guild_id"]: document for document in documents}
+        for guild_id in guild_ids:
+            self._cache_doc(guild_id, found.get(guild_id))
+        return {guild_id: found.get(guild_id, {}) for guild_id in guild_ids}
+
+    async def get_prefs(self, guild_id: int) -> dict:
+        cached = self.cache.get(guild_id)
+        if cached and (self.ttl <= 0 or time.monotonic() - cached[1] < self.ttl):
+            return cached[0]
+
+        result = await run_in_executor(self.pref.find_one, {"guild_id": guild_id})
+        self._cache_doc(guild_id, result)
+        return result or {}
+
+    async def set_pref(self, pref: str, pref_value, guild_id: int):
+        result = await run_in_executor(
+            self.pref.find_one_and_update,
+            {"guild_id": guild_id},
+            {"$set": {pref: pref_value}},
+            upsert=True,
+            return_document=pymongo.ReturnDocument.AFTER,
+        )
+        self._cache_doc(guild_id, result)
+        return result
+
+    async def get_pref(self, pref: str, guild_id: int):
+        return (await self.get_prefs(guild_id)).get(pref, None)
 
 
 gpdb = GuildPreferencesDB(client)
@@ -60,19 +252,26 @@ class PrivateDMThreadDB:
         self.db = self.client.IGCSEBot
         self.dm_threads = self.db["private_dm_threads"]
 
-    def new_thread(self, user_id: int, thread_id: int):
-        self.dm_threads.insert_one({"_id": str(user_id), "thread_id": str(thread_id)})
+    async def new_thread(self, user_id: int, thread_id: int):
+        await run_in_executor(
+            self.dm_threads.insert_one,
+            {"_id": str(user_id), "thread_id": str(thread_id)},
+        )
         return bot.get_channel(thread_id)
 
     async def del_thread(self, member: discord.Member, thread: discord.Thread):
-        self.dm_threads.delete_one({"thread_id": str(thread.id)})
+        await run_in_executor(
+            self.dm_threads.delete_one, {"thread_id": str(thread.id)}
+        )
         channel: discord.TextChannel = bot.get_channel(DMS_CLOSED_CHANNEL_ID)
         await channel.set_permissions(member, overwrite=None)
         return thread.delete()
 
     async def get_thread(self, member: discord.Member, create_anyway: bool = True):
-        result = self.dm_threads.find_one({"_id": str(member.id)})
-        dm_closed_channel_id = gpdb.get_pref("closed_dm_channel", member.guild.id)
+        result = await run_in_executor(
+            self.dm_threads.find_one, {"_id": str(member.id)}
+        )
+        dm_closed_channel_id = await gpdb.get_pref("closed_dm_channel", member.guild.id)
         channel: discord.TextChannel = bot.get_channel(
             int(dm_closed_channel_id)
         ) or await bot.fetch_channel(int(dm_closed_channel_id))
@@ -85,7 +284,7 @@ class PrivateDMThreadDB:
                 send_messages_in_threads=True,
             )
             thread = await channel.create_thread(name=member.name)
-            return self.new_thread(member.id, thread.id)
+            return await self.new_thread(member.id, thread.id)
         elif not create_anyway:
             return None
         else:
@@ -95,109 +294,265 @@ class PrivateDMThreadDB:
 dmsdb = PrivateDMThreadDB(client)
 
 class ReputationDB:
-    def __init__(self, client: pymongo.MongoClient):
+    def __init__(
+        self,
+        client: pymongo.MongoClient,
+        flush_interval: float = REP_WRITE_BEHIND_INTERVAL,
+    ):
         self.client = client
         self.db = self.client.IGCSEBot
         self.reputation = self.db.reputation
-
-    def bulk_insert_rep(self, rep_dict: dict, guild_id: int):
+        # Write-behind mode (flush_interval > 0) coalesces increments into one
+        # bulk_write. rep_cache holds the current rep of users with increments
+        # not yet written, and is dropped for everyone else after each flush so
+        # writes made elsewhere show up again.
+        self.flush_interval = flush_interval
+        self.rep_cache: dict[tuple[int, int], int] = {}
+        self.pending: dict[tuple[int, int], int] = {}
+        self.flush_task: asyncio.Task | None = None
+        self.flush_lock = asyncio.Lock()
+
+    async def bulk_insert_rep(self, rep_dict: dict, guild_id: int):
         # rep_dict = eval("{DICT}".replace("\n","")) to restore reputation from #rep-backup
         insertion = [
             {"user_id": user_id, "rep": rep, "guild_id": guild_id}
             for user_id, rep in rep_dict.items()
         ]
-        result = self.reputation.insert_many(insertion)
+        async with self.flush_lock:
+            await self.write_pending()
+            result = await run_in_executor(self.reputation.insert_many, insertion)
+            for user_id in rep_dict:
+                self.invalidate((user_id, guild_id))
         return result
 
-    def get_rep(self, user_id: int, guild_id: int):
-        result = self.reputation.find_one({"user_id": user_id, "guild_id": guild_id})
+    async def get_rep(self, user_id: int, guild_id: int):
+        if (user_id, guild_id) in self.rep_cache:
+            return self.rep_cache[(user_id, guild_id)]
+        result = await run_in_executor(
+            self.reputation.find_one, {"user_id": user_id, "guild_id": guild_id}
+        )
         if result is None:
             return None
         else:
             return result["rep"]
 
-    def change_rep(self, user_id, new_rep, guild_id):
-        result = self.reputation.update_one(
-            {"user_id": user_id, "guild_id": guild_id}, {"$set": {"rep": new_rep}}
-        )
+    def invalidate(self, key: tuple[int, int], rep: int = 0):
+        """Forgets a user's cached rep after it was written directly.
 
-        if result.matched_count == 0:
-            self.reputation.insert_one(
-                {"user_id": user_id, "guild_id": guild_id, "rep": new_rep}
+        Increments made while that write was running are still pending, so
+        their user stays cached at the written rep plus those increments.
+        """
+        if key in self.pending:
+            self.rep_cache[key] = rep + self.pending[key]
+        else:
+            self.rep_cache.pop(key, None)
+
+    async def change_rep(self, user_id, new_rep, guild_id):
+        # Under flush_lock so no batch of increments can land in between.
+        async with self.flush_lock:
+            await self.write_pending()
+            await run_in_executor(
+                self.reputation.update_one,
+                {"user_id": user_id, "guild_id": guild_id},
+                {"$set": {"rep": new_rep}},
+                upsert=True,
             )
+            self.invalidate((user_id, guild_id), new_rep)
 
         return new_rep
 
-    def delete_user(self, user_id: int, guild_id: int):
-        return self.reputation.delete_one({"user_id": user_id, "guild_id": guild_id})
+    async def delete_user(self, user_id: int, guild_id: int):
+        async with self.flush_lock:
+            await self.write_pending()
+            result = await run_in_executor(
+                self.reputation.delete_one, {"user_id": user_id, "guild_id": guild_id}
+            )
+            self.invalidate((user_id, guild_id))
+        return result
+
+    async def add_rep(self, user_id: int, guild_id: int):
+        if self.flush_interval > 0:
+            return await self.add_rep_buffered(user_id, guild_id)
 
-    def add_rep(self, user_id: int, guild_id: int):
-        rep = self.get_rep(user_id, guild_id)
-        if rep is None:
-            self.reputation.insert_one(
-                {"user_id": user_id, "guild_id": guild_id, "rep": 1}
+        result = await run_in_executor(
+            self.reputation.find_one_and_update,
+            {"user_id": user_id, "guild_id": guild_id},
+            {"$inc": {"rep": 1}},
+            upsert=True,
+            return_document=pymongo.ReturnDocument.AFTER,
+        )
+        return result["rep"]
+
+    async def add_rep_buffered(self, user_id: int, guild_id: int):
+        key = (user_id, guild_id)
+        if key not in self.rep_cache:
+            rep = await self.get_rep(user_id, guild_id)
+            # Another message may have loaded the user while we were waiting.
+            self.rep_cache.setdefault(key, rep or 0)
+
+        # The event loop runs one coroutine at a time, so this increment and
+        # the value returned to handle_rep can't interleave with another one.
+        self.rep_cache[key] += 1
+        self.pending[key] = self.pending.get(key, 0) + 1
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.create_task(self.delayed_flush())
+        return self.rep_cache[key]
+
+    async def delayed_flush(self):
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self):
+        # Held across the write so change_rep/delete_user can't overtake a
+        # batch of increments that is still in flight.
+        async with self.flush_lock:
+            await self.write_pending()
+
+    async def write_pending(self):
+        # Callers hold flush_lock.
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        operations = [
+            pymongo.UpdateOne(
+                {"user_id": user_id, "guild_id": guild_id},
+                {"$inc": {"rep": increment}},
+                upsert=True,
+            )
+            for (user_id, guild_id), increment in pending.items()
+        ]
+        try:
+            await run_in_executor(self.reputation.bulk_write, operations, ordered=False)
+        except pymongo.errors.PyMongoError:
+            for key, increment in pending.items():
+                self.pending[key] = self.pending.get(key, 0) + increment
+            if self.flush_task is None or self.flush_task.done():
+                self.flush_task = asyncio.create_task(self.delayed_flush())
+            raise
+        # The database is current for everyone not incremented since.
+        for key in pending:
+            if key not in self.pending:
+                self.rep_cache.pop(key, None)
+
+    async def rep_leaderboard(self, guild_id, limit: int = 0):
+        """The guild's rep holders, highest first; only the top limit if set."""
+        await self.flush()
+
+        def leaderboard():
+            return list(
+                self.reputation.find(
+                    {"guild_id": guild_id}, {"_id": 0, "guild_id": 0}
+                )
+                .sort("rep", -1)
+                .limit(limit)
             )
-            return 1
-        else:
-            rep += 1
-            self.change_rep(user_id, rep, guild_id)
-            return rep
 
-    def rep_leaderboard(self, guild_id):
-        leaderboard = self.reputation.find(
-            {"guild_id": guild_id}, {"_id": 0, "guild_id": 0}
-        ).sort("rep", -1)
-        return list(leaderboard)
+        return await run_in_executor(leaderboard)
 
 
 repdb = ReputationDB(client)
 
 
 class StickyMessageDB:
-    def __init__(self, client):
+    def __init__(
+        self,
+        client,
+        quiet_window: float = STICKY_QUIET_WINDOW,
+        min_messages: int = STICKY_MIN_MESSAGES,
+        max_messages: int = STICKY_MAX_MESSAGES,
+    ):
         self.client = client
         self.db = self.client.IGCSEBot
         self.sticky_messages = self.db.sticky_messages
+        self.quiet_window = quiet_window
+        self.min_messages = min_messages
+        self.max_messages = max_messages
+        # identifier -> StickyMessage; Redis is only written to so message IDs
+        # survive a restart.
+        self.stickies: dict[str, StickyMessage] = {}
+        self.unseen: dict[int, int] = {}
+        self.timers: dict[int, asyncio.Task] = {}
+        self.locks: dict[int, asyncio.Lock] = {}
+        self.watermark: datetime | None = None
+        self.last_sync = {"fetched": 0, "saved": 0, "removed": 0}
 
     async def get_sticky_messages(self, channel_id: int):
-        sticky_messages = StickyMessage.find(
-            StickyMessage.channel_id == str(channel_id)
-        ).all()
-        return list(sticky_messages)
+        return [
+            sticky_message
+            for sticky_message in self.stickies.values()
+            if sticky_message.channel_id == str(channel_id)
+        ]
 
-    async def check_stick_msg(self, reference_msg: discord.Message):
-        message_channel = reference_msg.channel
-        sticky_messages = await self.get_sticky_messages(message_channel.id)
-        for sticky_message in sticky_messages:
-            try:
-                message = message_channel.get_partial_message(
-                    int(sticky_message.message_id)
-                )
-                await message.delete()
-            except discord.NotFound:
-                pass
+    def notify(self, channel):
+        """Counts a message in a sticky channel and schedules a re-post.
 
-            embeds = []
-            for embed in sticky_message.content:
-                embeds.append(discord.Embed.from_dict(embed))
+        Once min_messages have buried the sticky, it is re-posted when the
+        channel has been quiet for quiet_window seconds, or straight away once
+        max_messages have arrived, so a burst costs one delete and one send.
+        """
+        self.unseen[channel.id] = self.unseen.get(channel.id, 0) + 1
+        if self.unseen[channel.id] < self.min_messages:
+            return
+        timer = self.timers.pop(channel.id, None)
+        if timer:
+            timer.cancel()
+        delay = (
+            0 if self.unseen[channel.id] >= self.max_messages else self.quiet_window
+        )
+        self.timers[channel.id] = asyncio.create_task(
+            self.repost_after(channel, delay)
+        )
+
+    async def repost_after(self, channel, delay: float):
+        await asyncio.sleep(delay)
+        # Past this point a newer message schedules its own timer instead of
+        # cancelling a re-post that is halfway through.
+        if self.timers.get(channel.id) is asyncio.current_task():
+            del self.timers[channel.id]
+        if self.unseen.get(channel.id, 0) >= self.min_messages:
+            await self.repost(channel)
+
+    async def repost(self, channel):
+        lock = self.locks.setdefault(channel.id, asyncio.Lock())
+        async with lock:
+            self.unseen[channel.id] = 0
+            for sticky_message in await self.get_sticky_messages(channel.id):
+                if not sticky_message.enabled:
+                    continue
+                try:
+                    message = channel.get_partial_message(
+                        int(sticky_message.message_id)
+                    )
+                    await message.delete()
+                except discord.NotFound:
+                    pass
+
+                embeds = []
+                for embed in sticky_message.content:
+                    embeds.append(discord.Embed.from_dict(embed))
 
-            new_message = await message_channel.send(embeds=embeds)
+                new_message = await channel.send(embeds=embeds)
 
-            sticky_message.message_id = str(new_message.id)
-            sticky_message.save()
+                sticky_message.message_id = str(new_message.id)
+                await run_redis(sticky_message.save)
+
+    async def check_stick_msg(self, reference_msg: discord.Message):
+        await self.repost(reference_msg.channel)
 
     async def stick(self, reference_msg):
         embeds = reference_msg.embeds
         if len(embeds) < 1:
             return
 
-        mongo_sticky = self.sticky_messages.insert_one(
+        mongo_sticky = await run_in_executor(
+            self.sticky_messages.insert_one,
             {
                 "channel_id": str(reference_msg.channel.id),
                 "message_id": str(reference_msg.id),
                 "content": [embed.to_dict() for embed in embeds],
                 "enabled": True,
-            }
+                "updated_at": datetime.now(timezone.utc),
+            },
         )
 
         sticky = StickyMessage(
@@ -207,7 +562,9 @@ class StickyMessageDB:
             enabled=True,
             identifier=str(mongo_sticky.inserted_id),
         )
-        sticky.save()
+        self.stickies[sticky.identifier] = sticky
+        await run_redis(sticky.save)
+        self.set_sticky_channels()
 
         await self.check_stick_msg(reference_msg)
 
@@ -218,54 +575,115 @@ class StickyMessageDB:
         if len(embeds) < 1:
             return
 
-        message = StickyMessage.find(
-            StickyMessage.message_id == str(reference_msg.id)
-        ).all()
-        identifier = message[0].identifier
-        StickyMessage.delete(identifier)
+        identifier = next(
+            sticky_message.identifier
+            for sticky_message in self.stickies.values()
+            if sticky_message.message_id == str(reference_msg.id)
+        )
+        del self.stickies[identifier]
+        await run_redis(StickyMessage.delete, identifier)
+        self.set_sticky_channels()
 
-        self.sticky_messages.delete_one({"_id": ObjectId(identifier)})
+        await run_in_executor(
+            self.sticky_messages.delete_one, {"_id": ObjectId(identifier)}
+        )
 
         return True
 
-    async def set_sticky_channels(self):
-        global_vars.sticky_channels = list(self.sticky_messages.distinct("channel_id"))
-
-    async def populate_cache(self):
-        await self.set_sticky_channels()
-        message_ids = {}
-
-        for x in StickyMessage.find().all():
-            message_ids[x.identifier] = x.message_id
-            StickyMessage.delete(x.identifier)
-
-        sticky_messages = self.sticky_messages.find({})
-        for sticky_message in sticky_messages:
-
-            enabled = sticky_message["enabled"]
-
-            if sticky_message.get("unstick_time", None) and sticky_message.get(
-                "stick_time", None
-            ):
-                enabled = False
-                if sticky_message["unstick_time"] < time.time():
-                    self.sticky_messages.delete_one({"_id": sticky_message["_id"]})
-                    continue
-                elif sticky_message["stick_time"] > time.time():
-                    enabled = True
-
-            message_id = message_ids.get(
-                str(sticky_message["_id"]), sticky_message["message_id"]
+    def set_sticky_channels(self):
+        global_vars.sticky_channels = {
+            sticky_message.channel_id for sticky_message in self.stickies.values()
+        }
+
+    def window_enabled(self, fields, now: float) -> bool:
+        if fields["stick_time"] is None or fields["unstick_time"] is None:
+            return bool(fields["enabled"])
+        return fields["stick_time"] <= now < fields["unstick_time"]
+
+    async def populate_cache(self) -> dict:
+        """Brings the in-memory and Redis sticky caches up to date with MongoDB.
+
+        Only documents whose updated_at is past the previous sync are read in
+        full; deletions are found from an _id-only listing. Redis is written
+        for the entries that actually changed. Returns how many documents the
+        sync fetched, saved and removed.
+        """
+        started = datetime.now(timezone.utc)
+        query = {}
+        if self.watermark:
+            # Overlap with the previous sync so a write that committed while
+            # it was running is still picked up.
+            query = {"updated_at": {"$gt": self.watermark - STICKY_SYNC_OVERLAP}}
+
+        def fetch():
+            return (
+                list(self.sticky_messages.find(query)),
+                {str(doc["_id"]) for doc in self.sticky_messages.find({}, {"_id": 1})},
             )
 
-            save_in_redis = StickyMessage(
-                channel_id=str(sticky_message["channel_id"]),
-                message_id=str(message_id),
-                content=sticky_message["content"],
-                enabled=enabled,
-                identifier=str(sticky_message["_id"]),
-            )
-            save_in_redis.save()
+        changed, identifiers = await run_in_executor(fetch)
+        now = time.time()
+        stats = {"fetched": len(changed), "saved": 0, "removed": 0}
+
+        if self.watermark is None:
+            # First sync after a restart: recover the posted message IDs and
+            # drop Redis entries whose documents are gone.
+            for x in await run_redis(lambda: StickyMessage.find().all()):
+                if x.identifier in identifiers:
+                    self.stickies.setdefault(x.identifier, x)
+                else:
+                    await run_redis(StickyMessage.delete, x.identifier)
+
+        for sticky_message in changed:
+            identifier = str(sticky_message["_id"])
+            cached = self.stickies.get(identifier)
+            fields = {
+                "channel_id": str(sticky_message["channel_id"]),
+                "content": sticky_message["content"],
+                "enabled": sticky_message["enabled"],
+                "stick_time": sticky_message.get("stick_time"),
+                "unstick_time": sticky_message.get("unstick_time"),
+            }
+            fields["enabled"] = self.window_enabled(fields, now)
+            if cached is None:
+                cached = StickyMessage(
+                    identifier=identifier,
+                    message_id=str(sticky_message["message_id"]),
+                    **fields,
+                )
+                self.stickies[identifier] = cached
+            elif all(cached[key] == value for key, value in fields.items()):
+                continue
+            else:
+                # Update the live object so a re-post that is in flight keeps
+                # writing its new message ID to the entry that stays cached.
+                for key, value in fields.items():
+                    cached[key] = value
+            await run_redis(cached.save)
+            stats["saved"] += 1
+
+        for identifier, cached in list(self.stickies.items()):
+            if identifier not in identifiers or (
+                cached.unstick_time is not None and cached.unstick_time <= now
+            ):
+                del self.stickies[identifier]
+                await run_redis(StickyMessage.delete, identifier)
+                if identifier in identifiers:
+                    await run_in_executor(
+                        self.sticky_messages.delete_one, {"_id": ObjectId(identifier)}
+                    )
+                stats["removed"] += 1
+                continue
+            enabled = self.window_enabled(cached, now)
+            if bool(cached.enabled) != enabled:
+                cached.enabled = enabled
+                await run_redis(cached.save)
+                stats["saved"] += 1
+
+        self.set_sticky_channels()
+        self.watermark = started
+        self.last_sync = stats
+        return stats
 
     async def timed_sticky(self, channel, message, stick_time, unstick_time):
         current_time = time.time()
@@ -273,7 +691,8 @@ class StickyMessageDB:
         if len(embeds) < 1:
             return
 
-        self.sticky_messages.insert_one(
+        result = await run_in_executor(
+            self.sticky_messages.insert_one,
             {
                 "channel_id": str(channel.id),
                 "message_id": str(message.id),
@@ -281,9 +700,38 @@ class StickyMessageDB:
                 "enabled": stick_time <= current_time,
                 "unstick_time": unstick_time,
                 "stick_time": stick_time,
-            }
+                "updated_at": datetime.now(timezone.utc),
+            },
+        )
+        return str(result.inserted_id)
+
+    async def timed_stickies(self) -> list[dict]:
+        return await run_in_executor(
+            lambda: list(
+                self.sticky_messages.find(
+                    {"unstick_time": {"$exists": True}},
+                    {"enabled": 1, "stick_time": 1, "unstick_time": 1},
+                )
+            )
         )
 
+    async def enable_timed_sticky(self, identifier: str):
+        result = await run_in_executor(
+            self.sticky_messages.update_one,
+            {"_id": ObjectId(identifier)},
+            {"$set": {"enabled": True, "updated_at": datetime.now(timezone.utc)}},
+        )
+        if result.matched_count:
+            await self.populate_cache()
+
+    async def expire_timed_sticky(self, identifier: str):
+        await run_in_executor(
+            self.sticky_messages.delete_one, {"_id": ObjectId(identifier)}
+        )
+        self.stickies.pop(identifier, None)
+        await run_redis(StickyMessage.delete, identifier)
+        self.set_sticky_channels()
+
 
 smdb = StickyMessageDB(client)
 
@@ -294,21 +742,26 @@ class KeywordsDB:
         self.db = self.client.IGCSEBot
         self.keywords = self.db.keywords
 
-    def get_keywords(self, guild_id: int):
-        result = self.keywords.find({"guild_id": guild_id}, {"_id": 0, "guild_id": 0})
+    async def get_keywords(self, guild_id: int):
+        result = await self.keyword_list(guild_id)
         return {i["keyword"].lower(): i["autoreply"] for i in result}
 
-    def keyword_list(self, guild_id: int):
-        return self.keywords.find({"guild_id": guild_id}, {"_id": 0, "guild_id": 0})
+    async def keyword_list(self, guild_id: int):
+        return await run_in_executor(
+            lambda: list(
+                self.keywords.find({"guild_id": guild_id}, {"_id": 0, "guild_id": 0})
+            )
+        )
 
-    def add_keyword(self, keyword: str, autoreply: str, guild_id: int):
-        return self.keywords.insert_one(
-            {"keyword": keyword.lower(), "autoreply": autoreply, "guild_id": guild_id}
+    async def add_keyword(self, keyword: str, autoreply: str, guild_id: int):
+        return await run_in_executor(
+            self.keywords.insert_one,
+            {"keyword": keyword.lower(), "autoreply": autoreply, "guild_id": guild_id},
         )
 
-    def remove_keyword(self, keyword: str, guild_id: int):
-        return self.keywords.delete_one(
-            {"keyword": keyword.lower(), "guild_id": guild_id}
+    async def remove_keyword(self, keyword: str, guild_id: int):
+        return await run_in_executor(
+            self.keywords.delete_one, {"keyword": keyword.lower(), "guild_id": guild_id}
         )
 
 
@@ -320,8 +773,66 @@ class PunishmentsDB:
         self.client = client
         self.db = self.client.IGCSEBot
         self.punishment_history = self.db.punishment_history
+        self.counters = self.db.counters
+        # Running infraction points per user, keyed "<guild id>:<user id>".
+        self.infraction_totals = self.db.infraction_totals
+
+    def _highest_case_id(self, guild_id: int | str) -> int:
+        result = list(
+            self.punishment_history.aggregate(
+                [
+                    {"$match": {"guild_id": str(guild_id)}},
+                    {
+                        "$group": {
+                            "_id": None,
+                            "highest": {
+                                "$max": {
+                                    "$convert": {
+                                        "input": "$case_id",
+                                        "to": "long",
+                                        "onError": 0,
+                                        "onNull": 0,
+                                    }
+                                }
+                            },
+                        }
+                    },
+                ]
+            )
+        )
+        return int(result[0]["highest"]) if result else 0
+
+    async def next_case_id(self, guild_id: int | str) -> int:
+        """Hands out the guild's next case number with a single $inc.
+
+        The counter is seeded from punishment_history the first time a guild
+        needs one; concurrent seeders lose on the duplicate _id and just take
+        the next number.
+        """
+        key = f"case_id:{guild_id}"
+
+        def increment():
+            return self.counters.find_one_and_update(
+                {"_id": key},
+                {"$inc": {"value": 1}},
+                return_document=pymongo.ReturnDocument.AFTER,
+            )
+
+        def seed_and_increment():
+            try:
+                self.counters.insert_one(
+                    {"_id": key, "value": self._highest_case_id(guild_id)}
+                )
+            except pymongo.errors.DuplicateKeyError:
+                pass
+            return increment()
+
+        counter = await run_in_executor(increment)
+        if counter is None:
+            counter = await run_in_executor(seed_and_increment)
+        return counter["value"]
 
-    def add_punishment(
+    async def add_punishment(
         self,
         case_id: int | str,
         action_against: int,
@@ -333,7 +844,8 @@ class PunishmentsDB:
         when=None,
         duration: str = None,
     ):
-        self.punishment_history.insert_one(
+        await run_in_executor(
+            self.punishment_history.insert_one,
             {
                 "case_id": str(case_id),
                 "action_against": str(action_against),
@@ -344,16 +856,194 @@ class PunishmentsDB:
                 "when": when or datetime.now(timezone.utc),
                 "points": points,
                 "guild_id": str(guild_id),
-            }
+            },
         )
+        if points:
+            await self._add_points(guild_id, action_against, points)
 
-    def get_punishments_by_user(self, user_id: int, guild_id: int | str):
-        return self.punishment_history.find(
-            {"action_against": str(user_id), "guild_id": str(guild_id)}
-        ).sort({"when": 1})
+    async def _add_points(self, guild_id: int | str, user_id: int | str, points: int):
+        await run_in_executor(
+            self.infraction_totals.update_one,
+            {"_id": f"{guild_id}:{user_id}"},
+            {
+                "$inc": {"points": points},
+                # Keeps a rebuild that is running right now from deleting it.
+                "$set": {"updated_at": datetime.now(timezone.utc)},
+                "$setOnInsert": {"guild_id": str(guild_id), "user_id": str(user_id)},
+            },
+            upsert=True,
+        )
 
-    def remove_punishment(self, identifier: str):
-        return self.punishment_history.delete_one({"_id": ObjectId(identifier)})
+    async def get_points(self, user_id: int, guild_id: int | str) -> int:
+        totals = await run_in_executor(
+            self.infraction_totals.find_one, {"_id": f"{guild_id}:{user_id}"}
+        )
+        return totals["points"] if totals else 0
+
+    async def get_users_over(self, guild_id: int | str, points: int) -> list[dict]:
+        """Users of a guild with at least points infraction points, highest first."""
+        return await run_in_executor(
+            lambda: list(
+                self.infraction_totals.find(
+                    {"guild_id": str(guild_id), "points": {"$gte": points}}
+                ).sort("points", -1)
+            )
+        )
+
+    async def rebuild_infraction_totals(self, guild_id: int | str | None = None) -> int:
+        """Recomputes infraction_totals from punishment_history.
+
+        Covers one guild, or every guild if guild_id is None. Returns the
+        number of users with a total.
+        """
+        scope = {} if guild_id is None else {"guild_id": str(guild_id)}
+        rebuilt_at = datetime.now(timezone.utc)
+
+        def rebuild():
+            self.punishment_history.aggregate(
+                [
+                    {"$match": scope},
+                    {
+                        "$group": {
+                            "_id": {
+                                "guild_id": "$guild_id",
+                                "user_id": "$action_against",
+                            },
+                            "points": {"$sum": {"$ifNull": ["$points", 0]}},
+                        }
+                    },
+                    {
+                        "$project": {
+                            "_id": {
+                                "$concat": ["$_id.guild_id", ":", "$_id.user_id"]
+                            },
+                            "guild_id": "$_id.guild_id",
+                            "user_id": "$_id.user_id",
+                            "points": 1,
+                            "updated_at": rebuilt_at,
+                        }
+                    },
+                    {
+                        "$merge": {
+                            "into": "infraction_totals",
+                            # A total _add_points touched after the scan started
+                            # is kept as is and recomputed below; replacing it
+                            # would lose that increment.
+                            "whenMatched": [
+                                {
+                                    "$replaceWith": {
+                                        "$cond": [
+                                            {"$gte": ["$updated_at", rebuilt_at]},
+                                            "$$ROOT",
+                                            "$$new",
+                                        ]
+                                    }
+                                }
+                            ],
+                            "whenNotMatched": "insert",
+                        }
+                    },
+                ]
+            )
+            # Totals of users whose punishments were all removed. Anything
+            # _add_points touched during the rebuild has a later timestamp.
+            self.infraction_totals.delete_many(
+                {**scope, "updated_at": {"$not": {"$gte": rebuilt_at}}}
+            )
+            for total in self.infraction_totals.find(
+                {**scope, "updated_at": {"$gte": rebuilt_at}}
+            ):
+                self._recompute_points(total["guild_id"], total["user_id"])
+            return self.infraction_totals.count_documents(scope)
+
+        return await run_in_executor(rebuild)
+
+    def _recompute_points(self, guild_id: str, user_id: str):
+        result = list(
+            self.punishment_history.aggregate(
+                [
+                    {"$match": {"guild_id": guild_id, "action_against": user_id}},
+                    {
+                        "$group": {
+                            "_id": None,
+                            "points": {"$sum": {"$ifNull": ["$points", 0]}},
+                        }
+                    },
+                ]
+            )
+        )
+        self.infraction_totals.update_one(
+            {"_id": f"{guild_id}:{user_id}"},
+            {"$set": {"points": result[0]["points"] if result else 0}},
+        )
+
+    async def seed_infraction_totals(self) -> int | None:
+        """Builds infraction_totals from scratch if it has never been built.
+
+        Returns the number of users with a total, or None if it already existed.
+        """
+        seeded, punished = await asyncio.gather(
+            run_in_executor(self.infraction_totals.find_one, {}, {"_id": 1}),
+            run_in_executor(self.punishment_history.find_one, {}, {"_id": 1}),
+        )
+        if seeded or not punished:
+            return None
+        return await self.rebuild_infraction_totals()
+
+    async def get_punishments_by_user(self, user_id: int, guild_id: int | str):
+        return await run_in_executor(
+            lambda: list(
+                self.punishment_history.find(
+                    {"action_against": str(user_id), "guild_id": str(guild_id)}
+                ).sort({"when": 1})
+            )
+        )
+
+    async def get_history_page(
+        self, user_id: int, guild_id: int | str, page: int, page_size: int
+    ) -> dict:
+        """One page of a user's punishments, newest first, with their totals.
+
+        Returns {"actions": {action: count}, "points": int, "rows": int,
+        "page": [documents]}. Everything but the points comes from a single
+        $facet aggregation; the points are read from infraction_totals.
+        """
+        pipeline = [
+            {"$match": {"action_against": str(user_id), "guild_id": str(guild_id)}},
+            {
+                "$facet": {
+                    "actions": [{"$group": {"_id": "$action", "count": {"$sum": 1}}}],
+                    "totals": [{"$count": "rows"}],
+                    "page": [
+                        {"$sort": {"when": -1}},
+                        {"$skip": page * page_size},
+                        {"$limit": page_size},
+                    ],
+                }
+            },
+        ]
+        results, points = await asyncio.gather(
+            run_in_executor(lambda: list(self.punishment_history.aggregate(pipeline))),
+            self.get_points(user_id, guild_id),
+        )
+        result = results[0]
+        totals = result["totals"][0] if result["totals"] else {}
+        return {
+            "actions": {action["_id"]: action["count"] for action in result["actions"]},
+            "points": points,
+            "rows": totals.get("rows", 0),
+            "page": result["page"],
+        }
+
+    async def remove_punishment(self, identifier: str):
+        removed = await run_in_executor(
+            self.punishment_history.find_one_and_delete, {"_id": ObjectId(identifier)}
+        )
+        if removed and removed.get("points"):
+            await self._add_points(
+                removed["guild_id"], removed["action_against"], -removed["points"]
+            )
+        return removed
 
 
 punishdb = PunishmentsDB(client)
@@ -364,8 +1054,51 @@ class QuestionsDB:
         self.client = client
         self.db = self.client.IGCSEBot
         self.igcse_questions = self.db.igcse_questions
+        # subject -> topic -> (negated years, ids), both sorted by year
+        # descending so a minimum year is a bisect away.
+        self.pools: dict[str, dict[str, tuple[list[int], list]]] | None = None
+
+    async def build_pools(self):
+        def load():
+            return list(
+                self.igcse_questions.find(
+                    {"$expr": {"$eq": [{"$type": "$answers"}, "string"]}},
+                    {"subject": 1, "year": 1, "topics": 1},
+                )
+            )
 
-    def get_questions(
+        grouped = {}
+        for question in await run_in_executor(load):
+            for topic in question.get("topics") or []:
+                grouped.setdefault(question["subject"], {}).setdefault(
+                    topic, []
+                ).append((-int(question["year"]), question["_id"]))
+
+        pools = {}
+        for subject, topics in grouped.items():
+            pools[subject] = {}
+            for topic, entries in topics.items():
+                entries.sort(key=lambda entry: entry[0])
+                pools[subject][topic] = (
+                    [entry[0] for entry in entries],
+                    [entry[1] for entry in entries],
+                )
+        self.pools = pools
+
+    def sample_ids(
+        self, subject_code: str, minimum_year: int, limit: int, topics: list[str]
+    ) -> list:
+        candidates = set()
+        for topic in topics:
+            pool = self.pools.get(subject_code, {}).get(topic)
+            if not pool:
+                continue
+            years, ids = pool
+            candidates.update(ids[: bisect.bisect_right(years, -minimum_year)])
+        # Uniform over distinct questions, like $sample over the $match.
+        return random.sample(list(candidates), min(limit, len(candidates)))
+
+    async def get_questions(
         self,
         subject_code: str,
         minimum_year: int,
@@ -373,25 +1106,173 @@ class QuestionsDB:
         topics: list[str],
         type: str = "mcq",
     ):
+        if type == "mcq" and self.pools is not None:
+            ids = self.sample_ids(subject_code, minimum_year, limit, topics)
+            questions = await run_in_executor(
+                lambda: list(self.igcse_questions.find({"_id": {"$in": ids}}))
+            )
+            random.shuffle(questions)
+            return questions
+
         if type == "mcq":
             mcq_filter = {
                 "$expr": {"$eq": [{"$type": "$answers"}, "string"]},
             }
         else:
             mcq_filter = {}
-        return self.igcse_questions.aggregate(
-            [
-                {
-                    "$match": {
-                        "subject": subject_code,
-                        "year": {"$gte": minimum_year},
-                        "topics": {"$elemMatch": {"$in": topics}},
-                        **mcq_filter,
-                    }
-                },
-                {"$sample": {"size": limit}},
-            ]
+        pipeline = [
+            {
+                "$match": {
+                    "subject": subject_code,
+                    "year": {"$gte": minimum_year},
+                    "topics": {"$elemMatch": {"$in": topics}},
+                    **mcq_filter,
+                }
+            },
+            {"$sample": {"size": limit}},
+        ]
+        return await run_in_executor(
+            lambda: list(self.igcse_questions.aggregate(pipeline))
         )
 
 
 questionsdb = QuestionsDB(client)
+
+
+class ShortLinksDB:
+    def __init__(self, client, size: int = SHORT_LINK_CACHE_SIZE):
+        self.client = client
+        self.db = self.client.IGCSEBot
+        self.short_links = self.db.short_links
+        # Most recently used long URL -> short URL, in front of the collection.
+        self.cache: OrderedDict[str, str] = OrderedDict()
+        self.size = size
+
+    def _remember(self, url: str, short: str):
+        self.cache[url] = short
+        self.cache.move_to_end(url)
+        while len(self.cache) > self.size:
+            self.cache.popitem(last=False)
+
+    async def shorten(self, urls: list[str]) -> list[str]:
+        """Short links for urls, in order; only unseen URLs hit TinyURL."""
+        missing = []
+        for url in urls:
+            if url in self.cache:
+                self.cache.move_to_end(url)
+            elif url not in missing:
+                missing.append(url)
+
+        if missing:
+            for document in await run_in_executor(
+                lambda: list(self.short_links.find({"_id": {"$in": missing}}))
+            ):
+                self._remember(document["_id"], document["short"])
+            missing = [url for url in missing if url not in self.cache]
+
+        if missing:
+            shortened = await asyncio.gather(*(shorten_url(url) for url in missing))
+            # A failed shortening falls back to the long URL; don't persist it.
+            new = {url: short for url, short in zip(missing, shortened) if short != url}
+            if new:
+                await run_in_executor(
+                    self.short_links.bulk_write,
+                    [
+                        pymongo.UpdateOne(
+                            {"_id": url}, {"$set": {"short": short}}, upsert=True
+                        )
+                        for url, short in new.items()
+                    ],
+                    ordered=False,
+                )
+            for url, short in new.items():
+                self._remember(url, short)
+
+        return [self.cache.get(url, url) for url in urls]
+
+
+linksdb = ShortLinksDB(client)
+
+
+# collection -> list of index key specs, created on startup by ensure_indexes.
+INDEXES = {
+    "guild_preferences": [[("guild_id", 1)]],
+    "reputation": [[("guild_id", 1), ("user_id", 1)], [("guild_id", 1), ("rep", -1)]],
+    "punishment_history": [[("guild_id", 1), ("action_against", 1), ("when", 1)]],
+    "infraction_totals": [[("guild_id", 1), ("points", -1)]],
+    "keywords": [[("guild_id", 1), ("keyword", 1)]],
+    "reaction_roles": [[("message", 1), ("reaction", 1)]],
+    "private_dm_threads": [[("thread_id", 1)]],
+    "sticky_messages": [[("channel_id", 1)]],
+    "channellock": [[("resolved", 1), ("time", 1)], [("channel_id", 1), ("resolved", 1)]],
+    "forumlock": [[("resolved", 1), ("time", 1)], [("thread_id", 1), ("resolved", 1)]],
+    "mute": [[("muted", 1), ("unmute_time", 1)], [("user_id", 1)]],
+    "dm_server_prefs": [[("user_id", 1)], [("resolved", 1), ("deleted_time", 1)]],
+    "hotmhelpers": [[("id", 1)], [("votes", -1)]],
+    "hotmvoters": [[("id", 1)]],
+    "igcse_questions": [[("subject", 1), ("year", 1), ("topics", 1)]],
+}
+
+# (collection, filter, sort) for the queries the bot runs most often.
+HOT_QUERIES = [
+    ("guild_preferences", {"guild_id": 0}, None),
+    ("reputation", {"guild_id": 0, "user_id": 0}, None),
+    ("reputation", {"guild_id": 0}, [("rep", -1)]),
+    ("punishment_history", {"action_against": "0", "guild_id": "0"}, [("when", 1)]),
+    ("infraction_totals", {"guild_id": "0", "points": {"$gte": 10}}, [("points", -1)]),
+    ("keywords", {"guild_id": 0}, None),
+    ("reaction_roles", {"reaction": "", "message": 0}, None),
+    ("private_dm_threads", {"thread_id": "0"}, None),
+    ("channellock", {"resolved": False}, None),
+    ("forumlock", {"resolved": False}, None),
+    ("mute", {"muted": True}, None),
+    ("mute", {"user_id": "0"}, None),
+    ("dm_server_prefs", {"user_id": 0}, None),
+    ("igcse_questions", {"subject": "", "year": {"$gte": 0}, "topics": {"$in": [""]}}, None),
+]
+
+
+async def ensure_indexes():
+    db = client.IGCSEBot
+
+    def create():
+        for collection, indexes in INDEXES.items():
+            for keys in indexes:
+                db[collection].create_index(keys, background=True)
+
+    await run_in_executor(create)
+
+
+def plan_stages(plan: dict) -> set[str]:
+    stages = {plan["stage"]} if "stage" in plan else set()
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages |= plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages |= plan_stages(child)
+    return stages
+
+
+async def explain_hot_queries() -> list[dict]:
+    db = client.IGCSEBot
+
+    def explain():
+        results = []
+        for collection, query, sort in HOT_QUERIES:
+            cursor = db[collection].find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            winning_plan = cursor.explain()["queryPlanner"]["winningPlan"]
+            stages = plan_stages(winning_plan)
+            results.append(
+                {
+                    "collection": collection,
+                    "query": query,
+                    "sort": sort,
+                    "stages": stages,
+                    "collscan": "COLLSCAN" in stages,
+                }
+            )
+        return results
+
+    return await run_in_executor(explain)
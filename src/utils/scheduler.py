@@ -0,0 +1,108 @@
+from typing import Callable
+import asyncio
+import heapq
+import itertools
+import time
+import traceback
+from utils.metrics import metrics
+
+
+class Scheduler:
+    """Runs timed jobs (locks, unmutes, timed stickies) at their exact deadline.
+
+    Jobs live in a min-heap keyed by unix time, so the runner only ever looks at
+    the earliest deadline and sleeps until then. MongoDB stays the source of
+    truth: each kind registers a loader that rebuilds its jobs on startup, and
+    a handler that re-reads its document when it fires, so a job whose document
+    was resolved or deleted in the meantime simply does nothing.
+    """
+
+    def __init__(self):
+        self.heap: list[tuple[float, int, str, object]] = []
+        self.jobs: dict[tuple[str, object], float] = {}
+        self.handlers: dict[str, Callable] = {}
+        self.loaders: dict[str, Callable] = {}
+        self.counter = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.retry_task: asyncio.Task | None = None
+
+    def handler(self, kind: str):
+        def decorator(func):
+            self.handlers[kind] = metrics.timed(f"job:{kind}")(func)
+            return func
+
+        return decorator
+
+    def loader(self, kind: str):
+        def decorator(func):
+            self.loaders[kind] = metrics.timed(f"loader:{kind}")(func)
+            return func
+
+        return decorator
+
+    def schedule(self, when: float, kind: str, key):
+        # Rescheduling replaces the old deadline; stale heap entries are skipped
+        # when popped instead of being searched for and removed.
+        if self.jobs.get((kind, key)) == when:
+            return
+        self.jobs[(kind, key)] = when
+        heapq.heappush(self.heap, (when, next(self.counter), kind, key))
+        if self.heap[0][0] == when:
+            self.wakeup.set()
+
+    def cancel(self, kind: str, key):
+        self.jobs.pop((kind, key), None)
+
+    def pending(self) -> int:
+        return len(self.jobs)
+
+    async def load(self, kind: str) -> bool:
+        try:
+            for when, key in await self.loaders[kind]():
+                self.schedule(when, kind, key)
+            return True
+        except Exception:
+            print(traceback.format_exc())
+            return False
+
+    async def recover(self):
+        failed = [kind for kind in self.loaders if not await self.load(kind)]
+        # A kind that couldn't be loaded (say Mongo was briefly unreachable at
+        # startup) would otherwise lose its pending jobs until the next restart.
+        if failed and (self.retry_task is None or self.retry_task.done()):
+            self.retry_task = asyncio.create_task(self.retry(failed))
+
+    async def retry(self, kinds: list[str], delay: float = 5, max_delay: float = 300):
+        while kinds:
+            await asyncio.sleep(delay)
+            kinds = [kind for kind in kinds if not await self.load(kind)]
+            delay = min(delay * 2, max_delay)
+
+    async def start(self):
+        if self.task and not self.task.done():
+            return
+        await self.recover()
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        while True:
+            self.wakeup.clear()
+            timeout = max(0, self.heap[0][0] - time.time()) if self.heap else None
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            while self.heap and self.heap[0][0] <= time.time():
+                when, _, kind, key = heapq.heappop(self.heap)
+                if self.jobs.get((kind, key)) != when:
+                    continue
+                del self.jobs[(kind, key)]
+                try:
+                    await self.handlers[kind](key)
+                except Exception:
+                    print(traceback.format_exc())
+
+
+scheduler = Scheduler()